@@ -1,15 +1,20 @@
 """The Light Manager Air integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from time import monotonic
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.service import async_extract_entity_ids
 
-from .const import DOMAIN, MAPPING_SCHEMA, CONF_MAPPINGS, CONF_ENTITY_CONVERSIONS, CONVERSION_SCHEMA, CONF_IGNORED_ZONES, CONF_COVER_TIMINGS, COVER_TIMING_SCHEMA
+from .const import DOMAIN, MAPPING_SCHEMA, CONF_MAPPINGS, CONF_ENTITY_CONVERSIONS, CONVERSION_SCHEMA, CONF_IGNORED_ZONES, CONF_COVER_TIMINGS, COVER_TIMING_SCHEMA, CONF_RADIO_CODES, RADIO_CODE_SCHEMA, CONF_RADIO_BINDINGS, RADIO_BINDING_SCHEMA, CONF_ACTUATOR_NAME, CONF_MARKER_ID, CONF_SCENE, CONF_COMMAND, SERVICE_SEND_COMMANDS, ATTR_COMMANDS, ATTR_CONFIG_ENTRY_ID, SERVICE_FORCE_TURN_ON, SERVICE_FORCE_TURN_OFF
 from .coordinator import LightManagerAirCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,13 +35,39 @@ CONFIG_SCHEMA = vol.Schema(
             vol.Optional(CONF_COVER_TIMINGS): vol.All(
                 cv.ensure_list, [COVER_TIMING_SCHEMA]
             ),
+            vol.Optional(CONF_RADIO_CODES): vol.All(
+                cv.ensure_list, [RADIO_CODE_SCHEMA]
+            ),
+            vol.Optional(CONF_RADIO_BINDINGS): vol.All(
+                cv.ensure_list, [vol.All(
+                    RADIO_BINDING_SCHEMA,
+                    cv.has_at_least_one_key(CONF_ACTUATOR_NAME, CONF_MARKER_ID, CONF_SCENE, CONF_COMMAND)
+                )]
+            ),
         })
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+SEND_COMMANDS_SCHEMA = vol.Schema({
+    vol.Required(ATTR_COMMANDS): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+FORCE_SERVICE_METHODS = {
+    SERVICE_FORCE_TURN_ON: "async_force_turn_on",
+    SERVICE_FORCE_TURN_OFF: "async_force_turn_off",
+}
+FORCE_SERVICE_DOMAINS = (Platform.LIGHT, Platform.SWITCH)
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Light Manager Air component."""
+    # Registered once for all domains, entity services of a platform only reach the entities of its own domain
+    for service in FORCE_SERVICE_METHODS:
+        hass.services.async_register(
+            DOMAIN, service, _async_handle_force_service, schema=cv.make_entity_service_schema({})
+        )
+
     if DOMAIN not in config:
         return True
 
@@ -50,6 +81,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         hass.data[DOMAIN][CONF_IGNORED_ZONES] = config[DOMAIN][CONF_IGNORED_ZONES]
     if CONF_COVER_TIMINGS in config[DOMAIN]:
         hass.data[DOMAIN][CONF_COVER_TIMINGS] = config[DOMAIN][CONF_COVER_TIMINGS]
+    if CONF_RADIO_CODES in config[DOMAIN]:
+        hass.data[DOMAIN][CONF_RADIO_CODES] = config[DOMAIN][CONF_RADIO_CODES]
+    if CONF_RADIO_BINDINGS in config[DOMAIN]:
+        hass.data[DOMAIN][CONF_RADIO_BINDINGS] = config[DOMAIN][CONF_RADIO_BINDINGS]
 
     return True
 
@@ -57,6 +92,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Light Manager Air from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    setup_started = monotonic()
 
     lm_coordinator = LightManagerAirCoordinator(hass, entry)
     await lm_coordinator.async_setup()
@@ -66,12 +102,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    setup_time = (monotonic() - setup_started) * 1000
+    lm_coordinator.stats["setup_time_ms"] = round(setup_time)
+    _LOGGER.info("Light Manager Air %s set up in %.0f ms", entry.title, setup_time)
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SEND_COMMANDS):
+        hass.services.async_register(
+            DOMAIN, SERVICE_SEND_COMMANDS, _async_handle_send_commands, schema=SEND_COMMANDS_SCHEMA
+        )
+
     return True
 
+async def _async_handle_send_commands(call: ServiceCall) -> None:
+    """Handle the send_commands service call."""
+    hass = call.hass
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+
+    coordinators = [
+        coordinator for key, coordinator in hass.data[DOMAIN].items()
+        if isinstance(coordinator, LightManagerAirCoordinator) and (not entry_id or key == entry_id)
+    ]
+    if not coordinators:
+        raise HomeAssistantError(f"No Light Manager Air found for config entry {entry_id}")
+
+    for coordinator in coordinators:
+        commands = [coordinator.light_manager.create_command(command) for command in call.data[ATTR_COMMANDS]]
+        try:
+            await coordinator.async_send_commands(commands)
+        except ConnectionError as e:
+            raise HomeAssistantError(e)
+
+async def _async_handle_force_service(call: ServiceCall) -> None:
+    """Handle the force_turn_on and force_turn_off service calls for lights and switches."""
+    method = FORCE_SERVICE_METHODS[call.service]
+    entity_ids = await async_extract_entity_ids(call.hass, call)
+
+    entities = [
+        entity for platform in async_get_platforms(call.hass, DOMAIN)
+        if platform.domain in FORCE_SERVICE_DOMAINS
+        for entity_id, entity in platform.entities.items()
+        if entity_id in entity_ids
+    ]
+    await asyncio.gather(*(getattr(entity, method)() for entity in entities))
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        if not any(isinstance(value, LightManagerAirCoordinator) for value in hass.data[DOMAIN].values()):
+            hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMANDS)
+
     return unload_ok 
\ No newline at end of file
@@ -6,9 +6,9 @@ from typing import Optional
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import CONF_ENTITY_ID, CONF_MARKER_ID, DOMAIN, CONF_MAPPINGS, CONF_INVERT, CONF_IGNORED_ZONES
-from .coordinator import DATA_UPDATE_EVENT
-from .lmair import _LMCommandContainer
+from .const import CONF_ENTITY_ID, CONF_MARKER_ID, DOMAIN, CONF_MAPPINGS, CONF_INVERT, CONF_IGNORED_ZONES, ATTR_FORCE
+from .coordinator import DATA_UPDATE_EVENT, SendResult
+from .lmair import _LMCommandContainer, LMCommand
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +41,7 @@ class LightManagerAirBaseEntity(ABC):
         # Keep existing unique_id format to maintain backward compatibility with automations
         self._attr_unique_id = f"{self._attr_device_id}_{unique_id_suffix}"
         self._mapped_marker_state = None
+        self._mapped_marker_id = None
         self._invert_marker = False
 
         if zone_name:
@@ -61,19 +62,24 @@ class LightManagerAirBaseEntity(ABC):
             # Create device info for main device entity
             self._attr_device_info = coordinator.device_info
 
+    @property
+    def marker_mapping(self) -> Optional[tuple[int, bool]]:
+        """Return the ID of the mapped marker (0-based) and if it is inverted, None if there is no mapping."""
+        for mapping in self._coordinator.hass.data[DOMAIN].get(CONF_MAPPINGS) or []:
+            if mapping[CONF_ENTITY_ID] == self.entity_id:
+                return mapping[CONF_MARKER_ID] - 1, mapping.get(CONF_INVERT, False)
+        return None
+
     def _update_marker_state(self):
         """Setup marker mapping if configured."""
-        if not self._coordinator.hass.data[DOMAIN].get(CONF_MAPPINGS):
+        marker_mapping = self.marker_mapping
+        if marker_mapping is None:
             return
 
-        for mapping in self._coordinator.hass.data[DOMAIN][CONF_MAPPINGS]:
-            if mapping[CONF_ENTITY_ID] == self.entity_id:
-                marker_id = mapping[CONF_MARKER_ID] - 1
-                self._invert_marker = mapping.get(CONF_INVERT, False)
-                for marker in self._coordinator.markers:
-                    if marker.marker_id == marker_id:
-                        self._mapped_marker_state = marker.state
-                        break
+        self._mapped_marker_id, self._invert_marker = marker_mapping
+        for marker in self._coordinator.markers:
+            if marker.marker_id == self._mapped_marker_id:
+                self._mapped_marker_state = marker.state
                 break
 
     @property
@@ -95,6 +101,11 @@ class LightManagerAirBaseEntity(ABC):
 
         await super().async_added_to_hass()
 
+    @property
+    def available(self) -> bool:
+        """Return if the Light Manager is reachable."""
+        return not self._coordinator.health.is_open
+
     @callback
     def _handle_coordinator_update(self, event):
         """Handle coordinator update event."""
@@ -102,30 +113,71 @@ class LightManagerAirBaseEntity(ABC):
             self._update_marker_state()
             self.async_write_ha_state()
 
+    def _is_redundant(self, state: bool) -> bool:
+        """Check if a command for the given state would have no effect.
+
+        Only mapped entities with a fresh marker state can be checked.
+        """
+        if self._mapped_marker_id is None or self.is_on is not state:
+            return False
+
+        if not self._coordinator.is_marker_state_fresh(self._mapped_marker_id):
+            return False
+
+        self._coordinator.stats["commands_suppressed"] += 1
+        _LOGGER.debug("%s is already %s, command suppressed", self.entity_id, "on" if state else "off")
+        return True
+
+    @callback
+    def _apply_optimistic_state(self, command: LMCommand, state: Optional[bool] = None,
+                                result: SendResult = SendResult.SENT) -> None:
+        """Update the marker states affected by a successfully sent command.
+
+        :param command: The sent command
+        :param state: Optional expected state of the entity
+        :param result: How the command was sent, markers are not changed by commands that bypassed the Light Manager
+        """
+        if result is not SendResult.SENT:
+            return
+        self._coordinator.apply_marker_command(command)
+        if state is not None and self._mapped_marker_id is not None:
+            self._coordinator.set_marker_state(self._mapped_marker_id, state != self._invert_marker)
+
     async def _async_call_command(self,
                                   hass: HomeAssistant,
                                   command_name: Optional[str] = None,
-                                  command_index: Optional[int] = None
-                                  ) -> None:
-        """Call a command by its name or index."""
+                                  command_index: Optional[int] = None,
+                                  state: Optional[bool] = None,
+                                  relative: bool = False
+                                  ) -> SendResult:
+        """Call a command by its name or index.
+
+        :param state: Optional expected state of the entity after the command
+        :param relative: True if the command toggles the entity, so it must not replace pending commands
+        :return: How the command was sent
+        """
+        result = SendResult.NOT_SENT
         if command_index is not None:
             try:
-                await hass.async_add_executor_job(
-                    self._command_container.commands[command_index].call
-                )
+                cmd = self._command_container.commands[command_index]
+                result = await self._coordinator.async_send_command(cmd, self._command_container, relative)
+                self._apply_optimistic_state(cmd, state, result)
             except (IndexError, ConnectionError) as e:
                 raise HomeAssistantError(e)
 
         if command_name:
+            relative = relative or "toggle" in command_name
             for cmd in self._command_container.commands:
                 if command_name in cmd.name.lower():
                     try:
-                        await hass.async_add_executor_job(cmd.call)
+                        result = await self._coordinator.async_send_command(cmd, self._command_container, relative)
+                        self._apply_optimistic_state(cmd, state, result)
                         break
                     except ConnectionError as e:
                         raise HomeAssistantError(e)
 
-        await self._coordinator.async_refresh()
+        await self._coordinator.async_request_marker_refresh()
+        return result
 
 
 class ToggleCommandMixin:
@@ -137,12 +189,26 @@ class ToggleCommandMixin:
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        await self._async_call_command(self.hass, command_index=self.COMMAND_ON)
+        if not kwargs.get(ATTR_FORCE) and self._is_redundant(True):
+            return None
+        return await self._async_call_command(self.hass, command_index=self.COMMAND_ON, state=True)
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        await self._async_call_command(self.hass, command_index=self.COMMAND_OFF)
+        if not kwargs.get(ATTR_FORCE) and self._is_redundant(False):
+            return None
+        return await self._async_call_command(self.hass, command_index=self.COMMAND_OFF, state=False)
+
+    async def async_force_turn_on(self):
+        """Turn the entity on, even if it is already on."""
+        await self.async_turn_on(**{ATTR_FORCE: True})
+
+    async def async_force_turn_off(self):
+        """Turn the entity off, even if it is already off."""
+        await self.async_turn_off(**{ATTR_FORCE: True})
 
     async def async_toggle(self, **kwargs):
         """Toggle the entity."""
-        await self._async_call_command(self.hass, command_index=self.COMMAND_TOGGLE)
+        state = None if self.is_on is None else not self.is_on
+        await self._async_call_command(self.hass, command_index=self.COMMAND_TOGGLE, state=state,
+                                       relative=True)
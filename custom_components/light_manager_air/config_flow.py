@@ -23,7 +23,24 @@ from .const import (
     CONF_WEATHER_UPDATE_INTERVAL,
     DEFAULT_WEATHER_UPDATE_INTERVAL,
     MINIMUM_FIRMWARE_VERSION,
+    CONF_RADIO_REPEAT_WINDOW,
+    DEFAULT_RADIO_REPEAT_WINDOW,
+    CONF_RADIO_HOLD_TIME,
+    DEFAULT_RADIO_HOLD_TIME,
+    CONF_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    CONF_RATE_WINDOW,
+    DEFAULT_RATE_WINDOW,
+    CONF_ENABLE_ZONE_GROUPS,
+    CONF_DIRECT_HTTP,
+    CONF_PACK_COMMANDS,
+    CONF_COMMAND_TTL,
+    DEFAULT_COMMAND_TTL,
+    CONF_SUPPRESS_REDUNDANT_COMMANDS,
+    CONF_MARKER_MAX_AGE,
+    DEFAULT_MARKER_MAX_AGE,
 )
+from .discovery import async_get_discovery_cache
 from .lmair import LMAir
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,28 +56,16 @@ class LightManagerAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ):
         """Handle a flow initiated by the user."""
         flow_error = None
-        options = []
 
-        # Safely discover devices
-        try:
-            _LOGGER.debug("Attempting to discover Light Manager Air devices...")
-            discovered_devices = await self.hass.async_add_executor_job(LMAir.discover)
-            
-            if discovered_devices:
-                _LOGGER.debug(f"Discovered {len(discovered_devices)} devices")
-                for device in discovered_devices:
-                    try:
-                        options.append(device.host)
-                        _LOGGER.debug(f"Added device with host: {device.host}")
-                    except Exception as host_err:
-                        _LOGGER.warning(f"Could not add discovered device to options: {host_err}")
-            else:
-                _LOGGER.debug("No devices discovered automatically")
-                
-        except Exception as disc_err:
-            _LOGGER.error(f"Error during device discovery: {disc_err}")
-            _LOGGER.debug(f"Discovery error details: {traceback.format_exc()}")
-            # Continue with an empty options list
+        # Devices are discovered in the background, the form is shown with the devices found so far
+        discovery_cache = async_get_discovery_cache(self.hass)
+        discovery_cache.async_refresh()
+        if not discovery_cache.hosts and user_input is None:
+            _LOGGER.debug("Waiting for discovery of Light Manager Air devices...")
+            await discovery_cache.async_wait_for_refresh()
+
+        options = discovery_cache.hosts
+        _LOGGER.debug(f"Discovered devices with hosts: {options}")
 
         if user_input:
             _LOGGER.debug(f"Processing user input: {user_input}")
@@ -184,22 +189,42 @@ class LightManagerAirOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ):
         """Manage the options."""
+        errors = {}
         try:
             if user_input is not None:
-                _LOGGER.debug(f"Saving options: {user_input}")
-                return self.async_create_entry(title="", data=user_input)
+                # A tap whose repeats span two polls must not be reported as hold
+                if user_input[CONF_RADIO_HOLD_TIME] <= user_input[CONF_RADIO_POLLING_INTERVAL]:
+                    errors[CONF_RADIO_HOLD_TIME] = "hold_time_too_short"
+                else:
+                    _LOGGER.debug(f"Saving options: {user_input}")
+                    return self.async_create_entry(title="", data=user_input)
 
-            # Get current options with defaults
-            current_radio_bus = self.config_entry.options.get(CONF_ENABLE_RADIO_BUS, True)
-            current_radio_interval = self.config_entry.options.get(
+            # Get current options with defaults, rejected input is shown again
+            options = {**self.config_entry.options, **(user_input or {})}
+            current_radio_bus = options.get(CONF_ENABLE_RADIO_BUS, True)
+            current_radio_interval = options.get(
                 CONF_RADIO_POLLING_INTERVAL, DEFAULT_RADIO_POLLING_INTERVAL
             )
-            current_marker_updates = self.config_entry.options.get(CONF_ENABLE_MARKER_UPDATES, True)
-            current_marker_interval = self.config_entry.options.get(
+            current_repeat_window = options.get(
+                CONF_RADIO_REPEAT_WINDOW, DEFAULT_RADIO_REPEAT_WINDOW
+            )
+            current_hold_time = options.get(
+                CONF_RADIO_HOLD_TIME, DEFAULT_RADIO_HOLD_TIME
+            )
+            current_rate_limit = options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)
+            current_rate_window = options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW)
+            current_marker_updates = options.get(CONF_ENABLE_MARKER_UPDATES, True)
+            current_marker_interval = options.get(
                 CONF_MARKER_UPDATE_INTERVAL, DEFAULT_MARKER_UPDATE_INTERVAL
             )
-            current_weather_updates = self.config_entry.options.get(CONF_ENABLE_WEATHER_UPDATES, True)
-            current_weather_interval = self.config_entry.options.get(
+            current_zone_groups = options.get(CONF_ENABLE_ZONE_GROUPS, False)
+            current_suppress = options.get(CONF_SUPPRESS_REDUNDANT_COMMANDS, False)
+            current_marker_max_age = options.get(CONF_MARKER_MAX_AGE, DEFAULT_MARKER_MAX_AGE)
+            current_command_ttl = options.get(CONF_COMMAND_TTL, DEFAULT_COMMAND_TTL)
+            current_pack_commands = options.get(CONF_PACK_COMMANDS, False)
+            current_direct_http = options.get(CONF_DIRECT_HTTP, False)
+            current_weather_updates = options.get(CONF_ENABLE_WEATHER_UPDATES, True)
+            current_weather_interval = options.get(
                 CONF_WEATHER_UPDATE_INTERVAL, DEFAULT_WEATHER_UPDATE_INTERVAL
             )
             
@@ -216,6 +241,22 @@ class LightManagerAirOptionsFlow(config_entries.OptionsFlow):
                             CONF_RADIO_POLLING_INTERVAL,
                             default=current_radio_interval,
                         ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_RADIO_REPEAT_WINDOW,
+                            default=current_repeat_window,
+                        ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_RADIO_HOLD_TIME,
+                            default=current_hold_time,
+                        ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_RATE_LIMIT,
+                            default=current_rate_limit,
+                        ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_RATE_WINDOW,
+                            default=current_rate_window,
+                        ): vol.Coerce(int),
                         vol.Required(
                             CONF_ENABLE_MARKER_UPDATES,
                             default=current_marker_updates,
@@ -224,6 +265,30 @@ class LightManagerAirOptionsFlow(config_entries.OptionsFlow):
                             CONF_MARKER_UPDATE_INTERVAL,
                             default=current_marker_interval,
                         ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_SUPPRESS_REDUNDANT_COMMANDS,
+                            default=current_suppress,
+                        ): bool,
+                        vol.Required(
+                            CONF_MARKER_MAX_AGE,
+                            default=current_marker_max_age,
+                        ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_ENABLE_ZONE_GROUPS,
+                            default=current_zone_groups,
+                        ): bool,
+                        vol.Required(
+                            CONF_COMMAND_TTL,
+                            default=current_command_ttl,
+                        ): vol.Coerce(int),
+                        vol.Required(
+                            CONF_PACK_COMMANDS,
+                            default=current_pack_commands,
+                        ): bool,
+                        vol.Required(
+                            CONF_DIRECT_HTTP,
+                            default=current_direct_http,
+                        ): bool,
                         vol.Required(
                             CONF_ENABLE_WEATHER_UPDATES,
                             default=current_weather_updates,
@@ -234,8 +299,7 @@ class LightManagerAirOptionsFlow(config_entries.OptionsFlow):
                         ): vol.Coerce(int)
                     }
                 ),
-                # Pass a properly typed None for the errors parameter
-            errors=None,
+            errors=errors,
             )
         except Exception as e:
             _LOGGER.error(f"Error in options flow: {e}")
@@ -31,8 +31,18 @@ CONF_IGNORED_SCENE_ZONE = "Scenes"
 DEFAULT_NAME = "Light Manager Air"
 
 DEFAULT_RADIO_POLLING_INTERVAL = 2000
+DEFAULT_RADIO_REPEAT_WINDOW = 2500
+DEFAULT_RADIO_HOLD_TIME = 3000  # Must be longer than the radio polling interval
 DEFAULT_MARKER_UPDATE_INTERVAL = 5000
 DEFAULT_WEATHER_UPDATE_INTERVAL = 30000
+MARKER_REFRESH_DELAY = 1.0  # in seconds
+COMMAND_QUEUE_RETRY_INTERVAL = 5  # in seconds
+COMMAND_QUEUE_MAX_SIZE = 50
+HEALTH_FAILURE_THRESHOLD = 3  # Failed requests in a row after which the Light Manager is offline
+HEALTH_MIN_PROBE_INTERVAL = 5  # in seconds
+HEALTH_MAX_PROBE_INTERVAL = 300  # in seconds
+HEALTH_PROBE_TIMEOUT = 1000  # in ms
+MIN_TRANSITION_STEP_INTERVAL = 0.5  # in seconds, time the Light Manager needs to send one radio command
 
 # Weather constants
 WEATHER_CHANNEL_NAME_TEMPLATE = "Channel {}"
@@ -129,6 +139,8 @@ CONVERSION_SCHEMA = vol.Schema({
 # Config flow constants
 CONF_ENABLE_RADIO_BUS = "enable_radio_bus"
 CONF_RADIO_POLLING_INTERVAL = "polling_interval"
+CONF_RADIO_REPEAT_WINDOW = "radio_repeat_window"
+CONF_RADIO_HOLD_TIME = "radio_hold_time"
 
 # Schema for the mapping
 MAPPING_SCHEMA = vol.Schema({
@@ -151,11 +163,69 @@ COVER_TIMING_SCHEMA = vol.Schema({
     vol.Optional(CONF_CUSTOM_STOP_LOGIC): vol.Coerce(bool),
 })
 
+# Radio code registry configuration
+CONF_RADIO_CODES = "radio_codes"
+CONF_RADIO_CODE = "code"
+CONF_RADIO_CODE_NAME = "name"
+
+MAX_LEARNED_RADIO_CODES = 100
+
+# Schema for named radio codes
+RADIO_CODE_SCHEMA = vol.Schema({
+    vol.Required(CONF_RADIO_CODE): str,
+    vol.Required(CONF_RADIO_CODE_NAME): str,
+})
+
+# Radio binding configuration
+CONF_RADIO_BINDINGS = "radio_bindings"
+CONF_COMMAND_NAME = "command_name"
+CONF_SCENE = "scene"
+CONF_COMMAND = "command"
+CONF_BINDING_EVENT = "event"
+
+VALID_BINDING_EVENTS = ["press", "hold", "release"]
+MARKER_ACTIONS = {"off": 0, "on": 1, "toggle": 2}
+
+# Schema for radio bindings, exactly one target per binding
+RADIO_BINDING_SCHEMA = vol.Schema({
+    vol.Required(CONF_RADIO_CODE): str,
+    vol.Optional(CONF_BINDING_EVENT, default="press"): vol.In(VALID_BINDING_EVENTS),
+    vol.Exclusive(CONF_ACTUATOR_NAME, "target"): str,
+    vol.Exclusive(CONF_MARKER_ID, "target"): int,
+    vol.Exclusive(CONF_SCENE, "target"): str,
+    vol.Exclusive(CONF_COMMAND, "target"): str,
+    vol.Optional(CONF_ZONE_NAME): str,
+    vol.Optional(CONF_COMMAND_NAME): str,
+})
+
+# Services
+SERVICE_SEND_COMMANDS = "send_commands"
+ATTR_COMMANDS = "commands"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+SERVICE_FORCE_TURN_ON = "force_turn_on"
+SERVICE_FORCE_TURN_OFF = "force_turn_off"
+ATTR_FORCE = "force"
+
 CONF_ENABLE_MARKER_UPDATES = "enable_marker_updates"
 
 MIN_POLLING_CALLS = 3
 POLLING_TIME_WINDOW = 60  # in seconds
 
+CONF_ENABLE_ZONE_GROUPS = "enable_zone_groups"
+
+CONF_COMMAND_TTL = "command_ttl"
+DEFAULT_COMMAND_TTL = 30000
+
+CONF_PACK_COMMANDS = "pack_commands"
+
+CONF_DIRECT_HTTP = "direct_http"
+ACTUATOR_TYPE_HTTP = "http"
+DIRECT_HTTP_TIMEOUT = 2  # in seconds
+
+CONF_SUPPRESS_REDUNDANT_COMMANDS = "suppress_redundant_commands"
+CONF_MARKER_MAX_AGE = "marker_max_age"
+DEFAULT_MARKER_MAX_AGE = 10000
+
 CONF_ENABLE_WEATHER_UPDATES = "enable_weather_updates"
 CONF_WEATHER_UPDATE_INTERVAL = "weather_update_interval"
 
@@ -165,6 +235,12 @@ class Priority(Enum):
 
 MINIMUM_FIRMWARE_VERSION = "11.1"
 
+DATA_DISCOVERY_CACHE = "discovery_cache"
+DISCOVERY_CACHE_TTL = 600  # in seconds
+DISCOVERY_REFRESH_INTERVAL = 30  # in seconds
+DISCOVERY_TRACK_INTERVAL = 300  # in seconds
+
 # Storage constants
 STORAGE_VERSION = 1
-STORAGE_KEY_COVER_POSITIONS = "cover_positions"
\ No newline at end of file
+STORAGE_KEY_COVER_POSITIONS = "cover_positions"
+STORAGE_KEY_RADIO_CODES = "radio_codes"
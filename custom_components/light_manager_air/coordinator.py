@@ -1,13 +1,25 @@
 """DataUpdateCoordinator for Light Manager Air."""
+import asyncio
+import ipaddress
 import logging
+from collections import Counter
 from datetime import timedelta
+from enum import IntEnum
+from time import monotonic
+from typing import Optional
+
+import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -21,52 +33,135 @@ from .const import (
     CONF_ENABLE_WEATHER_UPDATES,
     CONF_WEATHER_UPDATE_INTERVAL,
     DEFAULT_WEATHER_UPDATE_INTERVAL,
+    CONF_RADIO_REPEAT_WINDOW,
+    DEFAULT_RADIO_REPEAT_WINDOW,
+    CONF_RADIO_HOLD_TIME,
+    DEFAULT_RADIO_HOLD_TIME,
+    CONF_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    CONF_RATE_WINDOW,
+    DEFAULT_RATE_WINDOW,
+    CONF_RADIO_BINDINGS,
+    MARKER_REFRESH_DELAY,
+    CONF_ENABLE_ZONE_GROUPS,
+    CONF_SUPPRESS_REDUNDANT_COMMANDS,
+    CONF_MARKER_MAX_AGE,
+    DEFAULT_MARKER_MAX_AGE,
+    CONF_DIRECT_HTTP,
+    CONF_PACK_COMMANDS,
+    ACTUATOR_TYPE_HTTP,
+    DIRECT_HTTP_TIMEOUT,
+    CONF_COMMAND_TTL,
+    DEFAULT_COMMAND_TTL,
+    COMMAND_QUEUE_MAX_SIZE,
+    COMMAND_QUEUE_RETRY_INTERVAL,
+    HEALTH_FAILURE_THRESHOLD,
+    HEALTH_MIN_PROBE_INTERVAL,
+    HEALTH_MAX_PROBE_INTERVAL,
+    HEALTH_PROBE_TIMEOUT,
 )
-from .lmair import LMAir
+from .discovery import async_get_discovery_cache
+from .helpers.commandqueue import CommandQueue
+from .helpers.commandslot import CommandSlot
+from .helpers.connectionhealth import ConnectionHealth, HealthState
+from .helpers.signalaggregator import SignalAggregator, SignalPhase
+from .lmair import LMAir, LMRadioFrame, LMCommand, LMMarker, LMRequestError
+from .radio_bindings import build_radio_bindings
+from .radio_registry import RadioCodeRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
 
 RADIO_SIGNAL_EVENT = f"radio_signal"
+RADIO_SIGNAL_HOLD_EVENT = f"{RADIO_SIGNAL_EVENT}_hold"
+RADIO_SIGNAL_RELEASE_EVENT = f"{RADIO_SIGNAL_EVENT}_release"
+RADIO_SIGNAL_EVENTS = {
+    SignalPhase.PRESS: RADIO_SIGNAL_EVENT,
+    SignalPhase.HOLD: RADIO_SIGNAL_HOLD_EVENT,
+    SignalPhase.RELEASE: RADIO_SIGNAL_RELEASE_EVENT,
+}
 DATA_UPDATE_EVENT = f"{DOMAIN}_data_update"
 
 
+class SendResult(IntEnum):
+    """Enum class for the results of sending a command, false if it was not sent."""
+
+    NOT_SENT = 0  # Superseded by a newer command or queued
+    SENT = 1  # Sent via the Light Manager
+    SENT_DIRECT = 2  # Sent directly to the target, the Light Manager did not take part
+
+
+def _is_ip_address(host: str) -> bool:
+    """Check if the host is given as IP address."""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
 class UpdateHandler:
     """Handles periodic updates for a specific feature."""
 
-    def __init__(self, hass, coordinator, update_type, default_interval):
-        """Initialize the update handler."""
+    def __init__(self, hass, coordinator, update_type, default_interval, should_update=None):
+        """Initialize the update handler.
+
+        :param should_update: Optional callable, polls are skipped while it returns False
+        """
         self._hass = hass
         self._coordinator = coordinator
         self._update_type = update_type
         self._default_interval = default_interval
+        self._should_update = should_update
         self._unsubscribe = None
 
     async def _handle_update(self, _now=None):
         """Handle the update."""
+        if self._should_update and not self._should_update():
+            return
+
+        # Polls are suspended while the Light Manager is offline, it is probed instead
+        if self._coordinator.health.is_open:
+            return
+
         if self._coordinator.light_manager:
             try:
                 # Dynamically call the corresponding method
                 update_method = getattr(self._coordinator.light_manager, f"load_{self._update_type}")
+                polled_at = monotonic()
                 result = await self._hass.async_add_executor_job(update_method)
                 
                 # Special handling for Radio Bus signals
                 if self._update_type == "radio_signals":
-                    for signal in result:
-                        self._hass.bus.async_fire(RADIO_SIGNAL_EVENT, {
-                            "code": signal.get("signal_type") + "_" + signal.get("signal_code")
-                        })
+                    self._coordinator.handle_radio_signals(result, polled_at)
+                elif self._update_type == "markers":
+                    self._coordinator.handle_markers(result, polled_at)
+                    self._hass.bus.async_fire(DATA_UPDATE_EVENT, {
+                        "device_id": self._coordinator.device_id
+                    })
                 else:
                     setattr(self._coordinator, self._update_type, result)
                     self._hass.bus.async_fire(DATA_UPDATE_EVENT, {
                         "device_id": self._coordinator.device_id
                     })
 
+            except LMRequestError as e:
+                # The Light Manager is reachable, so the connection health is not affected
+                _LOGGER.warning("Light Manager Air rejected the %s update: %s", self._update_type, e)
             except ConnectionError:
-                pass
+                self._coordinator.async_handle_connection_error()
+            else:
+                self._coordinator.async_handle_connection_success()
+
+    async def async_update(self):
+        """Run a single update outside of the schedule."""
+        await self._handle_update()
 
-    def start(self, update_interval=None):
-        """Start periodic updates."""
+    def start(self, update_interval=None, immediate=True):
+        """Start periodic updates.
+
+        :param immediate: If false, the first update is done after one interval, e.g. because the data was just loaded
+        """
         if self._unsubscribe:
             return
 
@@ -78,7 +173,13 @@ class UpdateHandler:
             timedelta(milliseconds=update_interval)
         )
 
-        self._hass.async_create_task(self._handle_update())
+        if immediate:
+            self._hass.async_create_task(self._handle_update())
+
+    @property
+    def is_running(self):
+        """Return if periodic updates are started."""
+        return self._unsubscribe is not None
 
     def stop(self):
         """Stop periodic updates."""
@@ -105,55 +206,135 @@ class LightManagerAirCoordinator(DataUpdateCoordinator):
         self.scenes = []
         self.markers = []
         self.weather_channels = []
+        self.stats = Counter()
+        self.radio_codes = RadioCodeRegistry(hass, entry.entry_id)
         self._device_info = None
+        self._signal_aggregator = None
+        self._radio_frames: dict[str, LMRadioFrame] = {}
+        self._radio_bindings = {}
+        self._radio_idle = False
+        self._discard_radio_signals = False
+        self._optimistic_markers: dict[int, tuple[bool, float]] = {}
+        self._command_slots: dict[object, CommandSlot] = {}
+        self._command_queue = CommandQueue(
+            ttl=entry.options.get(CONF_COMMAND_TTL, DEFAULT_COMMAND_TTL) / 1000,
+            max_size=COMMAND_QUEUE_MAX_SIZE,
+        )
+        self._command_queue_retry = None
+        self._command_queue_draining = False
+        self.health = ConnectionHealth(
+            failure_threshold=HEALTH_FAILURE_THRESHOLD,
+            min_probe_interval=HEALTH_MIN_PROBE_INTERVAL,
+            max_probe_interval=HEALTH_MAX_PROBE_INTERVAL,
+        )
+        self._cancel_health_probe = None
+        self._identifying_hosts: set[str] = set()
+        self._zone_groups_enabled = entry.options.get(CONF_ENABLE_ZONE_GROUPS, False)
+        self._markers_polled_at: Optional[float] = None
+        self._setup_data_fresh = False
 
         self._update_handlers = {
-            "radio": UpdateHandler(hass, self, "radio_signals", DEFAULT_RADIO_POLLING_INTERVAL),
+            "radio": UpdateHandler(hass, self, "radio_signals", DEFAULT_RADIO_POLLING_INTERVAL,
+                                   should_update=self._has_radio_consumers),
             "markers": UpdateHandler(hass, self, "markers", DEFAULT_MARKER_UPDATE_INTERVAL),
             "weather": UpdateHandler(hass, self, "weather_channels", DEFAULT_WEATHER_UPDATE_INTERVAL)
         }
 
-        self._start_enabled_update_handler()
+        # Confirmation reads after commands are collected into a single marker update
+        self._marker_refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=MARKER_REFRESH_DELAY,
+            immediate=False,
+            function=self._update_handlers["markers"].async_update,
+        )
 
-    def _start_enabled_update_handler(self):
-        """Start all enabled features."""
-        if self.entry.options.get(CONF_ENABLE_RADIO_BUS, True):
-            self._update_handlers["radio"].start(
-                self.entry.options.get(CONF_RADIO_POLLING_INTERVAL)
-            )
+    def _start_enabled_update_handler(self, after_setup=False):
+        """Start all enabled features.
+
+        :param after_setup: If true, radio and weather updates are deferred until Home Assistant is started
+                            and no data loaded by the setup is polled again right away
+        """
+        self._signal_aggregator = SignalAggregator(
+            repeat_window=self.entry.options.get(CONF_RADIO_REPEAT_WINDOW, DEFAULT_RADIO_REPEAT_WINDOW) / 1000,
+            hold_time=self.entry.options.get(CONF_RADIO_HOLD_TIME, DEFAULT_RADIO_HOLD_TIME) / 1000,
+            rate_limit=self.entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            rate_window=self.entry.options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW),
+        )
 
         if self.entry.options.get(CONF_ENABLE_MARKER_UPDATES, True):
             self._update_handlers["markers"].start(
-                self.entry.options.get(CONF_MARKER_UPDATE_INTERVAL)
+                self.entry.options.get(CONF_MARKER_UPDATE_INTERVAL),
+                immediate=not after_setup
+            )
+
+        if after_setup:
+            self.entry.async_on_unload(async_at_started(self.hass, self._start_deferred_update_handlers))
+        else:
+            self._start_deferred_update_handlers(self.hass)
+
+    @callback
+    def _start_deferred_update_handlers(self, _hass: HomeAssistant) -> None:
+        """Start the enabled features which are not needed while Home Assistant is starting."""
+        if self.entry.options.get(CONF_ENABLE_RADIO_BUS, True):
+            self._update_handlers["radio"].start(
+                self.entry.options.get(CONF_RADIO_POLLING_INTERVAL)
             )
 
         if self.entry.options.get(CONF_ENABLE_WEATHER_UPDATES, True):
+            # Weather data is loaded during setup, it is updated after one interval
             self._update_handlers["weather"].start(
-                self.entry.options.get(CONF_WEATHER_UPDATE_INTERVAL)
+                self.entry.options.get(CONF_WEATHER_UPDATE_INTERVAL),
+                immediate=False
             )
 
     async def _handle_options_update(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Handle options update."""
-        for handler in self._update_handlers.values():
-            handler.stop()
+        if entry.options.get(CONF_ENABLE_ZONE_GROUPS, False) != self._zone_groups_enabled:
+            # Entities are only created on setup
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
 
+        self._command_queue.ttl = entry.options.get(CONF_COMMAND_TTL, DEFAULT_COMMAND_TTL) / 1000
+        self.light_manager.batch_supported = entry.options.get(CONF_PACK_COMMANDS, False)
+        self._stop_update_handlers()
         self._start_enabled_update_handler()
 
+    @callback
+    def _stop_update_handlers(self) -> None:
+        """Stop all update handlers."""
+        for handler in self._update_handlers.values():
+            handler.stop()
+
     async def async_setup(self):
         """Set up the coordinator."""
         url = self.entry.data[CONF_HOST]
         username = self.entry.data[CONF_USERNAME]
         password = self.entry.data[CONF_PASSWORD]
 
+        # Independent steps run concurrently: stored radio codes and params, then config and weather
         try:
-            self.light_manager = await self.hass.async_add_executor_job(
-                LMAir, url, username, password
+            _, self.light_manager = await asyncio.gather(
+                self.radio_codes.async_load(),
+                self.hass.async_add_executor_job(LMAir, url, username, password),
+            )
+            polled_at = monotonic()
+            (self.zones, self.scenes), self.weather_channels = await asyncio.gather(
+                self.hass.async_add_executor_job(self.light_manager.load_fixtures),
+                self.hass.async_add_executor_job(self.light_manager.load_weather_channels),
             )
         except ConnectionError as e:
             raise ConfigEntryNotReady(e)
 
-        self.zones, self.scenes = await self.hass.async_add_executor_job(
-            self.light_manager.load_fixtures
+        self.light_manager.batch_supported = self.entry.options.get(CONF_PACK_COMMANDS, False)
+
+        # The marker states were loaded with the params, no need to poll them again
+        self.handle_markers(self.light_manager.initial_markers, polled_at)
+        self._setup_data_fresh = True
+
+        self._radio_bindings = build_radio_bindings(
+            self.hass.data[DOMAIN].get(CONF_RADIO_BINDINGS, []),
+            self.light_manager, self.zones, self.scenes
         )
 
         device_registry = dr.async_get(self.hass)
@@ -172,27 +353,501 @@ class LightManagerAirCoordinator(DataUpdateCoordinator):
         self.entry.async_on_unload(
             self.entry.add_update_listener(self._handle_options_update)
         )
+        self.entry.async_on_unload(self._marker_refresh_debouncer.async_cancel)
+        self.entry.async_on_unload(self._stop_update_handlers)
+        self.entry.async_on_unload(self._stop_command_queue)
+        self.entry.async_on_unload(self._stop_health_probe)
+        self.entry.async_on_unload(
+            async_get_discovery_cache(self.hass).async_listen(
+                self._handle_discovered_device, self.light_manager.mac_address
+            )
+        )
+
+        self._start_enabled_update_handler(after_setup=True)
+
+    async def async_request_marker_refresh(self) -> None:
+        """Request a debounced update of the marker states.
+
+        Returns immediately, the update is done after a burst of commands has ended.
+        """
+        await self._marker_refresh_debouncer.async_call()
 
     @property
     def device_info(self):
         """Return device info."""
         return self._device_info
 
+    @property
+    def statistics(self) -> dict:
+        """Return the runtime statistics of this device."""
+        return {
+            **self.stats,
+            "command_queue_length": len(self._command_queue),
+            "commands_queue_superseded": self._command_queue.superseded,
+            "commands_queue_expired": self._command_queue.expired,
+            "commands_queue_overflowed": self._command_queue.overflowed,
+            "commands_queue_rejected": self._command_queue.rejected,
+            "commands_replayed": self._command_queue.replayed,
+            **(self.light_manager.connection_stats if self.light_manager else {}),
+            "connection_state": self.health.state.value,
+            "connection_state_changes": self.health.transitions,
+        }
+
+    async def async_send_command(self, command: LMCommand, target: object, relative: bool = False) -> SendResult:
+        """Send a command, newer commands for the same target replace pending ones.
+
+        Toggles are not replaced, a toggle cancels out a pending toggle instead.
+
+        :param command: Command to send
+        :param target: Actuator, marker or scene the command belongs to
+        :param relative: True if the command is a toggle, marker toggles are detected by the command itself
+        :return: How the command was sent, NOT_SENT if it was superseded by a newer command
+                 or queued until the Light Manager is reachable again
+        :raises ConnectionError: If the command could not be sent and offline queueing is disabled
+        :raises LMRequestError: If the Light Manager rejected the command
+        """
+        slot = self._command_slots.get(target)
+        if slot is None:
+            slot = self._command_slots[target] = CommandSlot()
+
+        relative = relative or command.is_toggle
+        send = self._async_send
+        if (self.entry.options.get(CONF_DIRECT_HTTP, False)
+                and getattr(target, "type", None) == ACTUATOR_TYPE_HTTP
+                and command.http_request):
+            send = self._async_send_direct
+
+        try:
+            if self.health.is_open:
+                raise ConnectionError("Light Manager Air is offline")
+            sent = await slot.async_submit(command, send, relative)
+        except LMRequestError:
+            # A rejected command would be rejected again, so it is not queued
+            raise
+        except ConnectionError as err:
+            if not self._command_queue.ttl:
+                raise
+            _LOGGER.warning("Light Manager not reachable, command %s queued: %s", command, err)
+            self._command_queue.put(target, command, send, monotonic(), relative)
+            self.stats["commands_queued"] += 1
+            self._start_command_queue_retry()
+            return SendResult.NOT_SENT
+
+        if not sent:
+            self.stats["commands_superseded"] += 1
+            _LOGGER.debug("Command %s superseded by a newer command", command)
+            return SendResult.NOT_SENT
+
+        if not relative:
+            # The intent of a queued command was replaced by this one
+            self._command_queue.discard(target)
+        return sent
+
+    async def async_send_commands(self, commands: list[LMCommand], targets: Optional[list[object]] = None) -> None:
+        """Send multiple commands with as few requests as possible.
+
+        :param commands: Commands to send in the given order
+        :param targets: Optional. Targets the commands belong to, their pending and queued commands are replaced
+        :raises ConnectionError: If the commands could not be sent
+        """
+        if self.health.is_open:
+            raise ConnectionError("Light Manager Air is offline")
+
+        # Older commands of the targets must not be sent after these ones
+        for target in targets or []:
+            self._command_queue.discard(target)
+        await asyncio.gather(*(
+            self._command_slots[target].async_flush() for target in targets or [] if target in self._command_slots
+        ))
+
+        try:
+            sent = await self.hass.async_add_executor_job(self.light_manager.send_commands, commands)
+        except LMRequestError:
+            raise
+        except ConnectionError:
+            self.async_handle_connection_error()
+            raise
+        self.async_handle_connection_success()
+        self.stats["commands_sent"] += len(sent)
+        if len(sent) < len(commands):
+            self.stats["scene_compressions"] += 1
+
+        for command in commands:
+            self.apply_marker_command(command)
+        await self.async_request_marker_refresh()
+
+    @callback
+    def _start_command_queue_retry(self) -> None:
+        """Periodically try to send the queued commands until the queue is empty."""
+        if self._command_queue_retry is None:
+            self._command_queue_retry = async_track_time_interval(
+                self.hass, self._async_drain_command_queue, timedelta(seconds=COMMAND_QUEUE_RETRY_INTERVAL)
+            )
+
+    @callback
+    def _stop_command_queue(self) -> None:
+        """Stop retrying and drop all queued commands."""
+        if self._command_queue_retry:
+            self._command_queue_retry()
+            self._command_queue_retry = None
+        self._command_queue.clear()
+
+    @callback
+    def async_handle_connection_success(self) -> None:
+        """Handle a request the Light Manager answered."""
+        if self.health.record_success():
+            _LOGGER.info("Light Manager Air is reachable again")
+            self._stop_health_probe()
+            self._async_fire_data_update()
+
+        if self._command_queue and not self._command_queue_draining:
+            self.hass.async_create_task(self._async_drain_command_queue())
+
+    @callback
+    def async_handle_connection_error(self) -> None:
+        """Handle a request the Light Manager did not answer, it may have got a new IP address."""
+        if self.health.record_failure(monotonic()):
+            if self.health.is_open:
+                _LOGGER.warning("Light Manager Air is offline, polling is suspended until it answers again")
+            self._async_fire_data_update()
+
+        if self.health.is_open and self._cancel_health_probe is None:
+            self._cancel_health_probe = async_call_later(
+                self.hass, max(self.health.next_probe_at - monotonic(), 0), self._async_probe
+            )
+
+        async_get_discovery_cache(self.hass).async_refresh()
+
+    async def _async_probe(self, _now=None) -> None:
+        """Check with a single request if the Light Manager is reachable again."""
+        self._cancel_health_probe = None
+        try:
+            await self.hass.async_add_executor_job(self.light_manager.probe, HEALTH_PROBE_TIMEOUT)
+        except LMRequestError as err:
+            # An answer is an answer, even if the request was rejected
+            _LOGGER.debug("Light Manager Air answered the probe with an error: %s", err)
+        except ConnectionError:
+            self.stats["connection_probes_failed"] += 1
+            self.async_handle_connection_error()
+            return
+
+        self.async_handle_connection_success()
+        # Bring all states up to date right away
+        for handler in self._update_handlers.values():
+            if handler.is_running:
+                self.hass.async_create_task(handler.async_update())
+
+    @callback
+    def _stop_health_probe(self) -> None:
+        """Cancel a scheduled probe."""
+        if self._cancel_health_probe:
+            self._cancel_health_probe()
+            self._cancel_health_probe = None
+
+    @callback
+    def _async_fire_data_update(self) -> None:
+        """Notify all entities that the data or the availability changed."""
+        self.hass.bus.async_fire(DATA_UPDATE_EVENT, {
+            "device_id": self.device_id
+        })
+
+    @callback
+    def _handle_discovered_device(self, host: str, mac: Optional[str]) -> None:
+        """Follow the Light Manager to a new IP address found by discovery."""
+        if not self.light_manager or host == self.light_manager.host:
+            return
+
+        # A configured hostname is only replaced if it does not lead to the device anymore
+        if self.health.state is HealthState.HEALTHY and not _is_ip_address(self.light_manager.host):
+            return
+
+        if mac:
+            if format_mac(mac) == format_mac(self.light_manager.mac_address):
+                self._async_update_host(host)
+        elif self.health.state is not HealthState.HEALTHY and host not in self._identifying_hosts:
+            # The answer contains no MAC address, so the device has to be asked
+            self._identifying_hosts.add(host)
+            self.hass.async_create_task(self._async_identify_host(host))
+
+    async def _async_identify_host(self, host: str) -> None:
+        """Check if the device at the given host is this Light Manager."""
+        try:
+            mac = await self.hass.async_add_executor_job(
+                LMAir.identify, host, self.light_manager.username, self.light_manager.password,
+                LMAir.DISCOVER_PROBE_TIMEOUT
+            )
+        except ConnectionError:
+            return
+        finally:
+            self._identifying_hosts.discard(host)
+
+        if format_mac(mac) == format_mac(self.light_manager.mac_address):
+            self._async_update_host(host)
+
+    @callback
+    def _async_update_host(self, host: str) -> None:
+        """Send all further requests to the new host."""
+        _LOGGER.info("Light Manager Air %s moved from %s to %s",
+                     self.light_manager.mac_address, self.light_manager.host, host)
+        self.light_manager.update_host(host)
+        self.stats["host_changes"] += 1
+        self.hass.config_entries.async_update_entry(self.entry, data={**self.entry.data, CONF_HOST: host})
+
+    async def _async_drain_command_queue(self, _now=None) -> None:
+        """Send all queued commands, stops at the first failure until the next try."""
+        if self._command_queue_draining or self.health.is_open:
+            return
+
+        self._command_queue_draining = True
+        replayed = self._command_queue.replayed
+        try:
+            await self._command_queue.async_drain(monotonic(), discard_on=(LMRequestError,))
+        except ConnectionError as err:
+            _LOGGER.debug("Light Manager still not reachable, %d commands queued: %s",
+                          len(self._command_queue), err)
+        finally:
+            self._command_queue_draining = False
+
+        if self._command_queue.replayed > replayed:
+            _LOGGER.info("Sent %d queued commands", self._command_queue.replayed - replayed)
+            await self.async_request_marker_refresh()
+
+        if not self._command_queue and self._command_queue_retry:
+            self._command_queue_retry()
+            self._command_queue_retry = None
+
+    async def _async_send(self, command: LMCommand) -> SendResult:
+        """Send a single command to the Light Manager."""
+        try:
+            await self.hass.async_add_executor_job(command.call)
+        except LMRequestError:
+            raise
+        except ConnectionError:
+            self.async_handle_connection_error()
+            raise
+        self.async_handle_connection_success()
+        self.stats["commands_sent"] += 1
+        return SendResult.SENT
+
+    async def _async_send_direct(self, command: LMCommand) -> SendResult:
+        """Send an HTTP command directly to its target, falls back to the Light Manager on failure."""
+        method, url, body = command.http_request
+        session = async_get_clientsession(self.hass)
+        try:
+            async with session.request(
+                method, url, data=body, timeout=aiohttp.ClientTimeout(total=DIRECT_HTTP_TIMEOUT)
+            ) as response:
+                response.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Direct request to %s failed, sending via Light Manager: %s", url, err)
+            self.stats["direct_http_fallbacks"] += 1
+            return await self._async_send(command)
+
+        self.stats["direct_http_sent"] += 1
+        return SendResult.SENT_DIRECT
+
+    @callback
+    def set_marker_state(self, marker_id: int, state: bool) -> None:
+        """Optimistically set the state of a marker after a successful command.
+
+        The state is kept until a marker update confirms or rolls it back.
+
+        :param marker_id: ID of the marker (0-based)
+        :param state: Expected state of the marker
+        """
+        for marker in self.markers:
+            if marker.marker_id == marker_id:
+                marker.state = state
+                break
+        self._optimistic_markers[marker_id] = (state, monotonic())
+
+        self.hass.bus.async_fire(DATA_UPDATE_EVENT, {
+            "device_id": self.device_id
+        })
+
+    def is_marker_state_fresh(self, marker_id: int) -> bool:
+        """Check if the known state of a marker is recent enough to skip redundant commands.
+
+        :param marker_id: ID of the marker (0-based)
+        :return: True if redundant commands may be suppressed for this marker
+        """
+        if not self.entry.options.get(CONF_SUPPRESS_REDUNDANT_COMMANDS, False):
+            return False
+
+        updated_at = self._markers_polled_at
+        optimistic = self._optimistic_markers.get(marker_id)
+        if optimistic:
+            updated_at = max(updated_at or 0, optimistic[1])
+        if updated_at is None:
+            return False
+
+        max_age = self.entry.options.get(CONF_MARKER_MAX_AGE, DEFAULT_MARKER_MAX_AGE) / 1000
+        return monotonic() - updated_at <= max_age
+
+    @callback
+    def apply_marker_command(self, command: LMCommand) -> None:
+        """Apply the effect of a successfully sent marker command to the marker states."""
+        marker_action = command.marker_action
+        if not marker_action:
+            return
+
+        marker_id, action = marker_action
+        if action == 2:
+            current = next((marker.state for marker in self.markers if marker.marker_id == marker_id), None)
+            if current is None:
+                return
+            self.set_marker_state(marker_id, not current)
+        else:
+            self.set_marker_state(marker_id, action == 1)
+
+    @callback
+    def handle_markers(self, markers: list[LMMarker], polled_at: float) -> None:
+        """Take over polled marker states and reconcile optimistic states.
+
+        :param markers: Polled markers
+        :param polled_at: Monotonic time the poll was started
+        """
+        for marker in markers:
+            optimistic = self._optimistic_markers.get(marker.marker_id)
+            if not optimistic:
+                continue
+
+            state, applied_at = optimistic
+            if polled_at < applied_at:
+                # The poll was started before the command, its state is outdated
+                marker.state = state
+                continue
+
+            del self._optimistic_markers[marker.marker_id]
+            if marker.state != state:
+                self.stats["optimistic_marker_rollbacks"] += 1
+                _LOGGER.warning(
+                    "Marker %s was expected to be %s but is %s, state rolled back",
+                    marker.marker_id + 1, "on" if state else "off", "on" if marker.state else "off"
+                )
+
+        self.markers = markers
+        self._markers_polled_at = polled_at
+
+    @callback
+    def _has_radio_consumers(self) -> bool:
+        """Check if anyone consumes radio events and track idle transitions."""
+        listeners = self.hass.bus.async_listeners()
+        has_consumers = bool(
+            self._radio_bindings
+            or self.radio_codes.has_listeners
+            or any(listeners.get(event_type) for event_type in RADIO_SIGNAL_EVENTS.values())
+        )
+
+        if has_consumers == self._radio_idle:
+            self._radio_idle = not has_consumers
+            _LOGGER.debug("Radio polling %s", "suspended, no consumers" if self._radio_idle else "resumed")
+            if self._radio_idle:
+                self._signal_aggregator.reset()
+                self._radio_frames.clear()
+            else:
+                self._discard_radio_signals = True
+
+        return has_consumers
+
+    @callback
+    def handle_radio_signals(self, frames: list[LMRadioFrame], polled_at: float) -> None:
+        """Aggregate the received radio frames and fire one event per press phase.
+
+        :param frames: Received radio frames
+        :param polled_at: Monotonic time the poll was started
+        """
+        if self._discard_radio_signals:
+            # Signals buffered by the device while polling was suspended are outdated
+            self._discard_radio_signals = False
+            return
+
+        codes = []
+        for frame in frames:
+            codes.append(frame.code)
+            self._radio_frames[frame.code] = frame
+        self.stats["radio_signals_received"] += len(codes)
+
+        dropped = self._signal_aggregator.dropped
+        events = self._signal_aggregator.process(codes, monotonic())
+        self.stats["radio_signals_flood_dropped"] += self._signal_aggregator.dropped - dropped
+
+        for event in events:
+            event_type = RADIO_SIGNAL_EVENTS[event.phase]
+            data = {
+                "code": event.code,
+                "type": event.phase.value,
+                "repeat_count": event.repeat_count,
+                "duration": round(event.duration, 3),
+            }
+            frame = self._radio_frames.get(event.code)
+            if event.phase is SignalPhase.RELEASE:
+                self._radio_frames.pop(event.code, None)
+            if frame:
+                data.update(frame.as_dict())
+            self.stats["radio_events_fired"] += 1
+
+            # Local bindings are run first, without going through the event bus
+            commands = self._radio_bindings.get((event.code, event.phase.value))
+            if commands:
+                self.hass.async_create_task(self._async_run_radio_binding(event.code, commands, polled_at))
+
+            if event.phase is SignalPhase.PRESS:
+                self.radio_codes.async_observe(event.code)
+
+            self.hass.bus.async_fire(event_type, data)
+            self.radio_codes.async_dispatch(event.code, event_type, data)
+
+    async def _async_run_radio_binding(self, code: str, commands: list[LMCommand], polled_at: float) -> None:
+        """Send the commands bound to a radio code and trace the latency."""
+        def send_commands():
+            for cmd in commands:
+                cmd.call()
+
+        try:
+            await self.hass.async_add_executor_job(send_commands)
+        except ConnectionError as e:
+            self.stats["radio_bindings_failed"] += 1
+            _LOGGER.warning("Radio binding for %s failed: %s", code, e)
+            return
+
+        for cmd in commands:
+            self.apply_marker_command(cmd)
+
+        latency = (monotonic() - polled_at) * 1000
+        self.stats["radio_bindings_executed"] += 1
+        self.stats["radio_binding_last_latency_ms"] = round(latency)
+        _LOGGER.debug("Radio binding for %s executed %.0f ms after the poll was started", code, latency)
+
     async def _async_update_data(self):
         """Fetch data from Light Manager Air."""
+        if self._setup_data_fresh:
+            # The first refresh takes over the data loaded during setup
+            self._setup_data_fresh = False
+            return
+
+        if self.health.is_open:
+            raise UpdateFailed("Light Manager Air is offline")
+
         try:
             # Update marker states
-            self.markers = await self.hass.async_add_executor_job(
+            polled_at = monotonic()
+            markers = await self.hass.async_add_executor_job(
                 self.light_manager.load_markers
             )
+            self.handle_markers(markers, polled_at)
             # Update weather data
             self.weather_channels = await self.hass.async_add_executor_job(
                 self.light_manager.load_weather_channels
             )
+            self.async_handle_connection_success()
 
             self.hass.bus.async_fire(DATA_UPDATE_EVENT, {
                 "device_id": self.device_id
             })
             
+        except LMRequestError as e:
+            raise UpdateFailed(e)
         except ConnectionError as e:
+            self.async_handle_connection_error()
             raise UpdateFailed(e)
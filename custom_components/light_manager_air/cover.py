@@ -16,11 +16,14 @@ from .base_entity import LightManagerAirBaseEntity, ToggleCommandMixin
 from .const import DOMAIN, CONF_ENTITY_CONVERSIONS, CONF_TARGET_TYPE, CONF_ZONE_NAME, CONF_ACTUATOR_NAME, \
     CONF_COVER_TIMINGS, CONF_ENTITY_ID, CONF_TRAVEL_UP_TIME, CONF_TRAVEL_DOWN_TIME, CONF_CUSTOM_STOP_LOGIC, \
     STORAGE_VERSION, STORAGE_KEY_COVER_POSITIONS
-from .coordinator import LightManagerAirCoordinator
+from .coordinator import LightManagerAirCoordinator, SendResult
 from .helpers.travelcalculator import TravelCalculator, TravelStatus
 
 _LOGGER = logging.getLogger(__name__)
 
+# Expected marker states after a cover command, open is mapped as on
+COMMAND_STATES = {"up": True, "down": False}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -154,18 +157,15 @@ class LightManagerAirCover(LightManagerAirBaseEntity, ToggleCommandMixin, CoverE
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
-        await self._send_open()
-
-        if self._tc:
+        # The cover only moves if the command was not superseded or queued
+        if await self._send_open() and self._tc:
             self._is_manual_position = False
             self._tc.start_travel_up()
             self._start_auto_updater()
 
     async def async_close_cover(self, **kwargs):
         """Close the cover."""
-        await self._send_close()
-
-        if self._tc:
+        if await self._send_close() and self._tc:
             self._is_manual_position = False
             self._tc.start_travel_down()
             self._start_auto_updater()
@@ -187,35 +187,42 @@ class LightManagerAirCover(LightManagerAirBaseEntity, ToggleCommandMixin, CoverE
             return
 
         current_position = self._tc.current_position()
+        result = None
         if position < current_position and self._tc.travel_direction != TravelStatus.DIRECTION_DOWN:
-            await self._send_close()
+            result = await self._send_close()
         elif position > current_position and self._tc.travel_direction != TravelStatus.DIRECTION_UP:
-            await self._send_open()
+            result = await self._send_open()
+
+        if result is SendResult.NOT_SENT:
+            return
 
         self._is_manual_position = position != 100 and position != 0
         self._tc.start_travel(position)
         self._start_auto_updater()
 
-    async def _send_open(self):
+    async def _send_open(self, relative: bool = False) -> Optional[SendResult]:
         if self._is_converted:
-            await self.async_turn_on()
-            return
+            if relative:
+                return await self._async_call_command(self.hass, command_index=self.COMMAND_ON, relative=True)
+            return await self.async_turn_on()
 
-        await self._send_command("up")
+        return await self._send_command("up", relative)
 
-    async def _send_close(self):
+    async def _send_close(self, relative: bool = False) -> Optional[SendResult]:
         if self._is_converted:
-            await self.async_turn_off()
-            return
+            if relative:
+                return await self._async_call_command(self.hass, command_index=self.COMMAND_OFF, relative=True)
+            return await self.async_turn_off()
 
-        await self._send_command("down")
+        return await self._send_command("down", relative)
 
     async def _send_stop(self):
         if self._tc and self._custom_stop_logic:
+            # Sending the direction again stops the motor, so it must not replace a pending command
             if self._tc.travel_direction == TravelStatus.DIRECTION_UP:
-                await self._send_open()
+                await self._send_open(relative=True)
             elif self._tc.travel_direction == TravelStatus.DIRECTION_DOWN:
-                await self._send_close()
+                await self._send_close(relative=True)
         else:
             if self._is_converted:
                 return  # No stop function available
@@ -223,11 +230,12 @@ class LightManagerAirCover(LightManagerAirBaseEntity, ToggleCommandMixin, CoverE
             # Try "stop" and "my" commands (for Somfy RTS)
             await self._send_command(["stop", "my"])
 
-    async def _send_command(self, command):
+    async def _send_command(self, command, relative: bool = False) -> SendResult:
         """Send command to the actuator.
         
         Args:
             command: String command name or list of command names to try
+            relative: True if the effect of the command depends on the current movement
         """
         commands = [command] if isinstance(command, str) else command
         
@@ -235,8 +243,10 @@ class LightManagerAirCover(LightManagerAirBaseEntity, ToggleCommandMixin, CoverE
             for cmd in self._actuator.commands:
                 if cmd.name.lower() == cmd_name.lower():
                     try:
-                        await self.hass.async_add_executor_job(cmd.call)
-                        return  # Command found and executed, exit function
+                        result = await self._coordinator.async_send_command(cmd, self._actuator, relative)
+                        if not relative:
+                            self._apply_optimistic_state(cmd, COMMAND_STATES.get(cmd_name.lower()), result)
+                        return result  # Command found and executed, exit function
                     except ConnectionError as e:
                         raise HomeAssistantError(e)
                         
@@ -0,0 +1,23 @@
+"""Diagnostics support for Light Manager Air."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import LightManagerAirCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LightManagerAirCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "options": dict(entry.options),
+        "firmware": coordinator.light_manager.fw_version,
+        "statistics": coordinator.statistics,
+    }
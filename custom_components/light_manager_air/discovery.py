@@ -0,0 +1,158 @@
+"""Cache of discovered Light Manager Air devices."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from datetime import timedelta
+from time import monotonic
+from typing import Callable, Optional
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DATA_DISCOVERY_CACHE,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_REFRESH_INTERVAL,
+    DISCOVERY_TRACK_INTERVAL,
+    DOMAIN,
+)
+from .lmair import LMAir
+
+_LOGGER = logging.getLogger(__name__)
+
+DiscoveryListener = Callable[[str, Optional[str]], None]
+
+
+async def async_get_discovery_adapters(hass: HomeAssistant) -> dict[str, str]:
+    """Return the IPs and broadcast addresses of all enabled IPv4 network adapters."""
+    adapters = {}
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for ipv4 in adapter["ipv4"]:
+            interface = ipaddress.IPv4Interface(f"{ipv4['address']}/{ipv4['network_prefix']}")
+            if interface.is_loopback:
+                continue
+            adapters[str(interface.ip)] = str(interface.network.broadcast_address)
+    return adapters
+
+
+class DiscoveryCache:
+    """Keeps the devices found by discovery, refreshed in the background."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache.
+
+        :param hass: Home Assistant instance
+        """
+        self._hass = hass
+        # Keyed by MAC address, or by host if the answer contains no MAC address
+        self._devices: dict[str, tuple[str, str, float]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Listeners with the MAC address of the device they follow
+        self._listeners: dict[DiscoveryListener, Optional[str]] = {}
+        self._unsubscribe_tracking = None
+
+    @property
+    def hosts(self) -> list[str]:
+        """Return the hosts of all devices that were seen within the time to live."""
+        now = monotonic()
+        for key, (_, _, seen_at) in list(self._devices.items()):
+            if now - seen_at > DISCOVERY_CACHE_TTL:
+                del self._devices[key]
+        return list(dict.fromkeys(host for host, _, _ in self._devices.values()))
+
+    @callback
+    def async_refresh(self, all_adapters: bool = True) -> None:
+        """Start a discovery in the background if the cache is outdated.
+
+        Found devices are merged into the cache while the discovery runs.
+
+        :param all_adapters: If false, only the adapters the devices of the listeners were last seen on are used
+        """
+        if self._refresh_task:
+            return
+
+        if self._refreshed_at is not None and monotonic() - self._refreshed_at < DISCOVERY_REFRESH_INTERVAL:
+            return
+
+        self._refresh_task = self._hass.async_create_background_task(
+            self._async_discover(all_adapters), f"{DOMAIN} discovery"
+        )
+
+    @callback
+    def async_listen(self, listener: DiscoveryListener, mac: Optional[str] = None) -> Callable[[], None]:
+        """Listen for discovery answers, devices are rediscovered periodically while anyone listens.
+
+        :param listener: Called with host and MAC address of every answer
+        :param mac: Optional. MAC address of the followed device, it is rediscovered on the adapter it was seen on
+        :return: Function to remove the listener
+        """
+        self._listeners[listener] = format_mac(mac) if mac else None
+        if self._unsubscribe_tracking is None:
+            self._unsubscribe_tracking = async_track_time_interval(
+                self._hass, self._async_handle_track_interval, timedelta(seconds=DISCOVERY_TRACK_INTERVAL)
+            )
+
+        @callback
+        def remove_listener() -> None:
+            del self._listeners[listener]
+            if not self._listeners and self._unsubscribe_tracking:
+                self._unsubscribe_tracking()
+                self._unsubscribe_tracking = None
+
+        return remove_listener
+
+    @callback
+    def _async_handle_track_interval(self, _now) -> None:
+        """Rediscover devices periodically."""
+        self.async_refresh(all_adapters=False)
+
+    async def async_wait_for_refresh(self) -> None:
+        """Wait until a running discovery is finished."""
+        if self._refresh_task:
+            await asyncio.shield(self._refresh_task)
+
+    def _listened_adapters(self, adapters: dict[str, str]) -> dict[str, str]:
+        """Return the adapters the devices of the listeners were last seen on.
+
+        All adapters are returned if any of the devices has not been seen on one of them yet.
+        """
+        listened = {}
+        for mac in self._listeners.values():
+            device = self._devices.get(mac) if mac else None
+            if device is None or device[1] not in adapters:
+                return adapters
+            listened[device[1]] = adapters[device[1]]
+        return listened
+
+    async def _async_discover(self, all_adapters: bool) -> None:
+        """Run a discovery and merge the answers into the cache."""
+        try:
+            adapters = await async_get_discovery_adapters(self._hass)
+            if not all_adapters:
+                adapters = self._listened_adapters(adapters)
+            async for host, mac, adapter_ip in LMAir.async_discover_iter(discover_adapters=adapters):
+                _LOGGER.debug("Discovered Light Manager Air %s at %s on adapter %s", mac, host, adapter_ip)
+                self._devices[format_mac(mac) if mac else host] = (host, adapter_ip, monotonic())
+                for listener in list(self._listeners):
+                    listener(host, mac)
+        except ConnectionError as err:
+            _LOGGER.debug("Discovery failed: %s", err)
+        finally:
+            self._refreshed_at = monotonic()
+            self._refresh_task = None
+
+
+@callback
+def async_get_discovery_cache(hass: HomeAssistant) -> DiscoveryCache:
+    """Return the discovery cache, it is created on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_DISCOVERY_CACHE not in data:
+        data[DATA_DISCOVERY_CACHE] = DiscoveryCache(hass)
+    return data[DATA_DISCOVERY_CACHE]
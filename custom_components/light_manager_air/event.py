@@ -14,7 +14,7 @@ from homeassistant.core import HomeAssistant, callback, Context
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
-from .coordinator import LightManagerAirCoordinator, RADIO_SIGNAL_EVENT
+from .coordinator import LightManagerAirCoordinator, RADIO_SIGNAL_EVENTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,16 +27,32 @@ async def async_setup_entry(
     """Set up Light Manager Air event entities."""
     coordinator: LightManagerAirCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([LightManagerAirRadioEvent(coordinator)])
+    entities = [LightManagerAirRadioEvent(coordinator)]
+    for code in coordinator.radio_codes.codes:
+        entities.append(LightManagerAirRadioCodeEvent(coordinator, code))
+
+    async_add_entities(entities)
+
+    @callback
+    def _async_add_code_entity(code: str) -> None:
+        """Add an event entity for a newly learned code."""
+        async_add_entities([LightManagerAirRadioCodeEvent(coordinator, code)])
+
+    coordinator.radio_codes.async_set_new_code_callback(_async_add_code_entity)
+    entry.async_on_unload(
+        lambda: coordinator.radio_codes.async_set_new_code_callback(None)
+    )
 
 
 class LightManagerAirRadioEvent(EventEntity):
     """Representation of a Light Manager Air radio event."""
 
     _attr_device_class = EventDeviceClass.BUTTON
-    _attr_event_types = ["radio_signal"]
+    _attr_event_types = list(RADIO_SIGNAL_EVENTS.values())
     _attr_has_entity_name = True
     _attr_name = "Radio Signal"
+    # Receives the traffic of all codes, so while enabled radio signals are always polled
+    _attr_entity_registry_enabled_default = False
 
     def __init__(self, coordinator: LightManagerAirCoordinator) -> None:
         """Initialize the event."""
@@ -47,9 +63,8 @@ class LightManagerAirRadioEvent(EventEntity):
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
-        self.hass.bus.async_listen(
-            RADIO_SIGNAL_EVENT,
-            self._handle_event
+        self.async_on_remove(
+            self._coordinator.radio_codes.async_listen_all(self._handle_signal)
         )
 
     @property
@@ -59,13 +74,43 @@ class LightManagerAirRadioEvent(EventEntity):
             return self._signal_data.get("code")
 
     @callback
-    def _handle_event(self, event) -> None:
+    def _handle_signal(self, event_type: str, data: dict) -> None:
         """Handle the radio signal event."""
-        self._signal_data = event.data
+        self._signal_data = data
 
         self._trigger_event(
-            RADIO_SIGNAL_EVENT,
+            event_type,
             self._signal_data
         )
 
         self.async_write_ha_state()
+
+
+class LightManagerAirRadioCodeEvent(EventEntity):
+    """Representation of the events of a single radio code."""
+
+    _attr_device_class = EventDeviceClass.BUTTON
+    _attr_event_types = list(RADIO_SIGNAL_EVENTS.values())
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: LightManagerAirCoordinator, code: str) -> None:
+        """Initialize the event."""
+        self._coordinator = coordinator
+        self._code = code
+        self._attr_device_id = coordinator.device_id
+        self._attr_unique_id = f"{coordinator.device_id}_radio_{code}"
+        self._attr_name = coordinator.radio_codes.name(code) or f"Radio {code}"
+        # Only codes named by the user are enabled, observed codes stay disabled until needed
+        self._attr_entity_registry_enabled_default = coordinator.radio_codes.is_named(code)
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        self.async_on_remove(
+            self._coordinator.radio_codes.async_listen(self._code, self._handle_signal)
+        )
+
+    @callback
+    def _handle_signal(self, event_type: str, data: dict) -> None:
+        """Handle an event of the radio code."""
+        self._trigger_event(event_type, data)
+        self.async_write_ha_state()
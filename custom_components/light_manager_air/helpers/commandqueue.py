@@ -0,0 +1,156 @@
+"""
+Module CommandQueue buffers commands while the Light Manager is unreachable.
+
+Only the latest command per target is kept, so a replay after a short outage sends
+the last intent of the user instead of every command that was requested meanwhile.
+Relative commands like toggles are kept in order behind it, two toggles cancel each other out.
+Commands expire after a time to live and are dropped.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, Iterator
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _QueuedCommand:
+    """Command waiting in the queue."""
+
+    __slots__ = (
+        "command",
+        "expires_at",
+        "relative",
+        "send",
+    )
+
+    def __init__(self, command: Any, send: Callable[[Any], Awaitable[None]], expires_at: float, relative: bool) -> None:
+        """Initialize _QueuedCommand class."""
+        self.command = command
+        self.send = send
+        self.expires_at = expires_at
+        self.relative = relative
+
+
+class CommandQueue:
+    """Class for buffering the latest command of each target until it can be sent."""
+
+    __slots__ = (
+        "_entries",
+        "expired",
+        "max_size",
+        "overflowed",
+        "rejected",
+        "replayed",
+        "superseded",
+        "ttl",
+    )
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        """Initialize CommandQueue class.
+
+        :param ttl: Seconds a command stays valid in the queue.
+        :param max_size: Maximum number of queued commands, the oldest one is dropped first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.expired = 0
+        self.overflowed = 0
+        self.rejected = 0
+        self.replayed = 0
+        self.superseded = 0
+        self._entries: dict[Any, list[_QueuedCommand]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entries)
+
+    def put(
+        self, target: Any, command: Any, send: Callable[[Any], Awaitable[None]], now: float, relative: bool = False
+    ) -> None:
+        """Queue a command, the queued commands of the same target are replaced.
+
+        A relative command is queued behind the commands of the target instead,
+        or cancels out a queued relative command.
+
+        :param target: Target the command belongs to.
+        :param command: Command to queue.
+        :param send: Coroutine function which sends the command.
+        :param now: Current monotonic time in seconds.
+        :param relative: True if the effect of the command depends on the state, e.g. a toggle.
+        """
+        entries = self._entries.get(target)
+
+        if relative and entries:
+            if entries[-1].relative:
+                # Two toggles in a row have no effect
+                entries.pop()
+                self.superseded += 2
+                if not entries:
+                    del self._entries[target]
+            else:
+                entries.append(_QueuedCommand(command, send, now + self.ttl, relative))
+            return
+
+        if entries:
+            del self._entries[target]
+            self.superseded += len(entries)
+        elif len(self) >= self.max_size:
+            oldest = next(iter(self._entries))
+            self.overflowed += len(self._entries.pop(oldest))
+            _LOGGER.debug("Command queue full, dropped commands for %s", oldest)
+
+        self._entries[target] = [_QueuedCommand(command, send, now + self.ttl, relative)]
+
+    def discard(self, target: Any) -> None:
+        """Remove the queued commands of a target, e.g. because a newer one was sent."""
+        entries = self._entries.pop(target, None)
+        if entries:
+            self.superseded += len(entries)
+
+    def clear(self) -> None:
+        """Remove all queued commands."""
+        self._entries.clear()
+
+    def expire(self, now: float) -> None:
+        """Drop all commands whose time to live has passed."""
+        for target, entries in list(self._entries.items()):
+            for entry in [entry for entry in entries if entry.expires_at <= now]:
+                entries.remove(entry)
+                self.expired += 1
+                _LOGGER.debug("Queued command %s expired", entry.command)
+            if not entries:
+                del self._entries[target]
+
+    async def async_drain(self, now: float, discard_on: tuple[type[Exception], ...] = ()) -> None:
+        """Send all queued commands in order of their arrival.
+
+        Stops at the first failure, the failed command and all following commands stay queued.
+
+        :param now: Current monotonic time in seconds.
+        :param discard_on: Exceptions after which the failed command is dropped instead, e.g. rejected commands.
+        :raises: Exception of the send function if sending failed.
+        """
+        self.expire(now)
+
+        while self._entries:
+            target, entries = next(iter(self._entries.items()))
+            entry = entries[0]
+            try:
+                await entry.send(entry.command)
+            except discard_on as err:
+                _LOGGER.debug("Queued command %s was rejected: %s", entry.command, err)
+                self.rejected += 1
+            else:
+                self.replayed += 1
+            # Newer commands may have replaced the entry while sending
+            entries = self._entries.get(target)
+            if entries and entries[0] is entry:
+                entries.pop(0)
+                if not entries:
+                    del self._entries[target]
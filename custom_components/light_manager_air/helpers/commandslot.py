@@ -0,0 +1,109 @@
+"""
+Module CommandSlot provides last-write-wins sending of commands for a single actuator.
+
+While a command is in flight, a newer command does not queue behind the older ones.
+It replaces the pending commands, so only the latest intent is sent afterwards.
+Relative commands like toggles depend on the commands before them, they are queued
+instead, and two pending toggles cancel each other out.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingCommand:
+    """Command waiting for the slot."""
+
+    __slots__ = (
+        "command",
+        "future",
+        "relative",
+        "send",
+    )
+
+    def __init__(self, command: Any, send: Callable[[Any], Awaitable[Any]], future: asyncio.Future,
+                 relative: bool) -> None:
+        """Initialize _PendingCommand class."""
+        self.command = command
+        self.send = send
+        self.future = future
+        self.relative = relative
+
+    def discard(self) -> None:
+        """Report the command as not sent."""
+        if not self.future.done():
+            self.future.set_result(False)
+
+
+class CommandSlot:
+    """Class for sending the commands of one actuator one at a time."""
+
+    __slots__ = (
+        "_pending",
+        "_task",
+    )
+
+    def __init__(self) -> None:
+        """Initialize CommandSlot class."""
+        self._pending: list[_PendingCommand] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def async_submit(self, command: Any, send: Callable[[Any], Awaitable[Any]], relative: bool = False) -> Any:
+        """Send a command as soon as the slot is free.
+
+        :param command: Command to send.
+        :param send: Coroutine function which sends a command and returns a true value.
+        :param relative: True if the effect of the command depends on the state, e.g. a toggle.
+        :return: Result of the send function, False if the command was replaced by a newer command or cancelled out.
+        :raises: Exception of the send function if sending failed.
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        if not relative:
+            for pending in self._pending:
+                pending.discard()
+            self._pending = [_PendingCommand(command, send, future, relative)]
+        elif self._pending and self._pending[-1].relative:
+            # Two toggles in a row have no effect
+            self._pending.pop().discard()
+            future.set_result(False)
+        else:
+            self._pending.append(_PendingCommand(command, send, future, relative))
+
+        if self._pending and not self._task:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        return await future
+
+    async def async_flush(self) -> None:
+        """Drop all pending commands and wait until the command being sent is finished."""
+        for pending in self._pending:
+            pending.discard()
+        self._pending = []
+
+        if self._task:
+            await asyncio.shield(self._task)
+
+    async def _run(self) -> None:
+        """Send pending commands until there are none left."""
+        try:
+            while self._pending:
+                pending = self._pending.pop(0)
+                try:
+                    # Each command may be sent another way, e.g. directly or via the Light Manager
+                    result = await pending.send(pending.command)
+                except Exception as err:
+                    if not pending.future.done():
+                        pending.future.set_exception(err)
+                else:
+                    if not pending.future.done():
+                        pending.future.set_result(result)
+        finally:
+            self._task = None
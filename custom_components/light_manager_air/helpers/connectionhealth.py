@@ -0,0 +1,100 @@
+"""
+Module ConnectionHealth tracks the reachability of a Light Manager.
+
+After several failed requests in a row the circuit opens: the device is considered offline
+and only probed at an exponentially growing interval until it answers again.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from enum import Enum
+from typing import Optional
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HealthState(Enum):
+    """Enum class for the health states of a connection."""
+
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    OFFLINE = "offline"
+
+
+class ConnectionHealth:
+    """Class for tracking the health of the connection to one device."""
+
+    __slots__ = (
+        "_failures",
+        "_probe_interval",
+        "failure_threshold",
+        "max_probe_interval",
+        "min_probe_interval",
+        "next_probe_at",
+        "state",
+        "transitions",
+    )
+
+    def __init__(self, failure_threshold: int, min_probe_interval: float, max_probe_interval: float) -> None:
+        """Initialize ConnectionHealth class.
+
+        :param failure_threshold: Number of failed requests in a row after which the device is offline.
+        :param min_probe_interval: Seconds until the first probe after the device went offline.
+        :param max_probe_interval: Maximum seconds between two probes.
+        """
+        self.failure_threshold = failure_threshold
+        self.min_probe_interval = min_probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.state = HealthState.HEALTHY
+        self.transitions = 0
+        self.next_probe_at: Optional[float] = None
+        self._failures = 0
+        self._probe_interval = min_probe_interval
+
+    @property
+    def is_open(self) -> bool:
+        """Return if the circuit is open, so no requests except probes should be sent."""
+        return self.state is HealthState.OFFLINE
+
+    def record_success(self) -> bool:
+        """Record an answered request.
+
+        :return: True if the state changed.
+        """
+        self._failures = 0
+        self._probe_interval = self.min_probe_interval
+        self.next_probe_at = None
+        return self._set_state(HealthState.HEALTHY)
+
+    def record_failure(self, now: float) -> bool:
+        """Record a request that was not answered.
+
+        :param now: Current monotonic time in seconds.
+        :return: True if the state changed.
+        """
+        self._failures += 1
+
+        if self.state is HealthState.OFFLINE:
+            # A failed probe, wait longer until the next one
+            self._probe_interval = min(self._probe_interval * 2, self.max_probe_interval)
+            self.next_probe_at = now + self._probe_interval
+            return False
+
+        if self._failures >= self.failure_threshold:
+            self.next_probe_at = now + self._probe_interval
+            return self._set_state(HealthState.OFFLINE)
+
+        return self._set_state(HealthState.DEGRADED)
+
+    def _set_state(self, state: HealthState) -> bool:
+        """Change the state and count the transition."""
+        if state is self.state:
+            return False
+
+        _LOGGER.debug("Connection state changed from %s to %s", self.state.value, state.value)
+        self.state = state
+        self.transitions += 1
+        return True
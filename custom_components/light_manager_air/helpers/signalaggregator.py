@@ -0,0 +1,170 @@
+"""
+Module SignalAggregator collapses repeated radio codes into press, hold and release events.
+
+Remotes repeat the same code many times per button press. The aggregator groups all
+sightings of a code that follow each other within the repeat window into one press.
+A press is only reported as hold if its code was received in several polls in a row.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from enum import Enum
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SignalPhase(Enum):
+    """Enum class for the phases of a radio button press."""
+
+    PRESS = "press"
+    HOLD = "hold"
+    RELEASE = "release"
+
+
+class SignalEvent:
+    """Aggregated radio signal event."""
+
+    __slots__ = (
+        "code",
+        "duration",
+        "phase",
+        "repeat_count",
+    )
+
+    def __init__(self, phase: SignalPhase, code: str, repeat_count: int, duration: float) -> None:
+        """Initialize SignalEvent class."""
+        self.phase = phase
+        self.code = code
+        self.repeat_count = repeat_count
+        self.duration = duration
+
+
+class _PressState:
+    """State of a code that is currently being received."""
+
+    __slots__ = (
+        "first_seen",
+        "hold_sent",
+        "last_seen",
+        "polls",
+        "repeat_count",
+        "suppressed",
+    )
+
+    def __init__(self, now: float, suppressed: bool) -> None:
+        """Initialize _PressState class."""
+        self.first_seen = now
+        self.last_seen = now
+        self.repeat_count = 1
+        self.polls = 1
+        self.hold_sent = False
+        self.suppressed = suppressed
+
+
+class SignalAggregator:
+    """Class for collapsing repeated radio codes into single events."""
+
+    # The repeats of a short tap can be split across two polls
+    MIN_HOLD_POLLS = 3
+
+    __slots__ = (
+        "_active",
+        "_press_history",
+        "dropped",
+        "hold_time",
+        "rate_limit",
+        "rate_window",
+        "repeat_window",
+    )
+
+    def __init__(self, repeat_window: float, hold_time: float, rate_limit: int, rate_window: float) -> None:
+        """Initialize SignalAggregator class.
+
+        :param repeat_window: Seconds without a repeat after which a press is released.
+        :param hold_time: Seconds a code has to repeat before a hold event is emitted.
+        :param rate_limit: Maximum number of presses per code within the rate window.
+        :param rate_window: Seconds of the flood limit window.
+        """
+        self.repeat_window = repeat_window
+        self.hold_time = hold_time
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.dropped = 0
+        self._active: dict[str, _PressState] = {}
+        self._press_history: dict[str, deque[float]] = {}
+
+    def process(self, codes: list[str], now: float) -> list[SignalEvent]:
+        """Process the codes of one poll and return the resulting events.
+
+        Must also be called with an empty list, so that presses can be released.
+
+        :param codes: Received codes in order of arrival.
+        :param now: Current monotonic time in seconds.
+        :return: List of events to fire.
+        """
+        events = []
+        seen = set()
+
+        for code in codes:
+            state = self._active.get(code)
+
+            if state and now - state.last_seen > self.repeat_window:
+                events.extend(self._release(code, state))
+                state = None
+
+            if state:
+                state.last_seen = now
+                state.repeat_count += 1
+                if code not in seen:
+                    seen.add(code)
+                    state.polls += 1
+                if (not state.suppressed and not state.hold_sent
+                        and state.polls >= self.MIN_HOLD_POLLS
+                        and now - state.first_seen >= self.hold_time):
+                    state.hold_sent = True
+                    events.append(SignalEvent(SignalPhase.HOLD, code, state.repeat_count, now - state.first_seen))
+                continue
+
+            seen.add(code)
+            suppressed = self._is_flooding(code, now)
+            self._active[code] = _PressState(now, suppressed)
+            if suppressed:
+                self.dropped += 1
+                _LOGGER.debug("Flood limit reached for radio code %s, press dropped", code)
+            else:
+                events.append(SignalEvent(SignalPhase.PRESS, code, 1, 0.0))
+
+        # Release all presses which were not repeated within the window
+        for code, state in list(self._active.items()):
+            if now - state.last_seen >= self.repeat_window:
+                events.extend(self._release(code, state))
+
+        return events
+
+    def reset(self) -> None:
+        """Forget all active presses without emitting events."""
+        self._active.clear()
+        self._press_history.clear()
+
+    def _release(self, code: str, state: _PressState) -> list[SignalEvent]:
+        """Remove the press of the given code and return its release event."""
+        del self._active[code]
+        if state.suppressed:
+            return []
+        return [SignalEvent(SignalPhase.RELEASE, code, state.repeat_count, state.last_seen - state.first_seen)]
+
+    def _is_flooding(self, code: str, now: float) -> bool:
+        """Record a new press and check if the code exceeds its flood limit."""
+        history = self._press_history.setdefault(code, deque())
+        while history and now - history[0] > self.rate_window:
+            history.popleft()
+
+        if len(history) >= self.rate_limit:
+            return True
+
+        history.append(now)
+        return False
@@ -1,4 +1,5 @@
 """Light platform for Light Manager Air."""
+import asyncio
 import logging
 import re
 
@@ -6,6 +7,8 @@ from homeassistant.components.light import (
     LightEntity,
     ColorMode,
     ATTR_BRIGHTNESS,
+    ATTR_TRANSITION,
+    LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -13,7 +16,8 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .base_entity import LightManagerAirBaseEntity, ToggleCommandMixin
-from .const import DOMAIN, CONF_ENTITY_CONVERSIONS, CONF_TARGET_TYPE, CONF_ZONE_NAME, CONF_ACTUATOR_NAME
+from .const import DOMAIN, CONF_ENTITY_CONVERSIONS, CONF_TARGET_TYPE, CONF_ZONE_NAME, CONF_ACTUATOR_NAME, \
+    CONF_ENABLE_ZONE_GROUPS, MIN_TRANSITION_STEP_INTERVAL
 from .coordinator import LightManagerAirCoordinator
 from .cover import LightManagerAirCover
 
@@ -33,9 +37,14 @@ async def async_setup_entry(
         if LightManagerAirBaseEntity.is_zone_ignored(zone.name, hass):
             continue
             
+        zone_lights = []
         for actuator in zone.actuators:
             if LightManagerAirLight.check_actuator(actuator, zone.name, hass):
-                entities.append(LightManagerAirLight(coordinator, zone, actuator))
+                zone_lights.append(LightManagerAirLight(coordinator, zone, actuator))
+        entities.extend(zone_lights)
+
+        if entry.options.get(CONF_ENABLE_ZONE_GROUPS, False) and len(zone_lights) > 1:
+            entities.append(LightManagerAirZoneLight(coordinator, zone, zone_lights))
 
     async_add_entities(entities)
 
@@ -71,27 +80,38 @@ class LightManagerAirLight(LightManagerAirBaseEntity, ToggleCommandMixin, LightE
         return actuator.type != "http" and any("%" in cmd.name for cmd in actuator.commands)
 
     @staticmethod
-    def _get_closest_brightness_command(actuator, brightness_pct):
-        """Get the command closest to the desired brightness percentage."""
+    def _get_brightness_levels(actuator):
+        """Get the brightness levels (0-255) of all percentage commands, sorted by brightness."""
         if not LightManagerAirLight._check_dimmable(actuator):
-            return None
+            return []
 
-        # Filter and convert percentage commands
-        pct_commands = []
+        levels = []
         for cmd in actuator.commands:
             if "%" in cmd.name:
                 try:
                     pct = int(cmd.name.replace("%", ""))
-                    pct_commands.append((pct, cmd))
+                    levels.append((round(pct * 255 / 100), cmd))
                 except ValueError:
                     continue
 
-        if not pct_commands:
+        levels.sort(key=lambda x: x[0])
+        return levels
+
+    @staticmethod
+    def _build_brightness_table(levels):
+        """Build a table with the closest command for each brightness from 0 to 255."""
+        if not levels:
             return None
 
-        # Find closest percentage
-        pct_commands.sort(key=lambda x: abs(x[0] - brightness_pct))
-        return pct_commands[0][1]
+        table = []
+        index = 0
+        for brightness in range(256):
+            # Move on while the next level is closer, ties go to the lower level
+            while (index + 1 < len(levels)
+                   and abs(levels[index + 1][0] - brightness) < abs(levels[index][0] - brightness)):
+                index += 1
+            table.append(levels[index])
+        return table
 
     def __init__(self, coordinator, zone, actuator):
         """Initialize the light."""
@@ -105,17 +125,181 @@ class LightManagerAirLight(LightManagerAirBaseEntity, ToggleCommandMixin, LightE
         self._actuator = actuator
         self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
         self._attr_color_mode = ColorMode.BRIGHTNESS
+        self._brightness_levels = self._get_brightness_levels(actuator)
+        self._brightness_table = self._build_brightness_table(self._brightness_levels)
+        self._transition_task = None
+        if self._brightness_table:
+            self._attr_supported_features = LightEntityFeature.TRANSITION
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a running transition."""
+        self._cancel_transition()
+        await super().async_will_remove_from_hass()
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on."""
-        if ATTR_BRIGHTNESS in kwargs and self._check_dimmable(self._actuator):
-            brightness_pct = round((kwargs[ATTR_BRIGHTNESS] / 255) * 100)
-            cmd = self._get_closest_brightness_command(self._actuator, brightness_pct)
-            if cmd:
-                try:
-                    await self.hass.async_add_executor_job(cmd.call)
-                    return
-                except ConnectionError as e:
-                    raise HomeAssistantError(e)
+        self._cancel_transition()
+
+        if self._brightness_table and (ATTR_BRIGHTNESS in kwargs or ATTR_TRANSITION in kwargs):
+            brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
+            if kwargs.get(ATTR_TRANSITION) and self._start_transition(brightness, kwargs[ATTR_TRANSITION]):
+                return
+
+            level, cmd = self._brightness_table[brightness]
+            try:
+                result = await self._coordinator.async_send_command(cmd, self._actuator)
+                if result:
+                    self._attr_brightness = level
+                    self._apply_optimistic_state(cmd, True, result)
+                return
+            except ConnectionError as e:
+                raise HomeAssistantError(e)
+
+        await super().async_turn_on(**kwargs)
+
+    async def async_turn_off(self, **kwargs):
+        """Turn the light off."""
+        self._cancel_transition()
+
+        if (self._brightness_table and kwargs.get(ATTR_TRANSITION) and self.is_on is not False
+                and self._start_transition(0, kwargs[ATTR_TRANSITION])):
+            return
+
+        await super().async_turn_off(**kwargs)
+        self._attr_brightness = None
+
+    async def async_toggle(self, **kwargs):
+        """Toggle the light, its brightness is unknown afterwards."""
+        self._cancel_transition()
+        await super().async_toggle(**kwargs)
+        self._attr_brightness = None
+
+    def _cancel_transition(self):
+        """Cancel a running transition."""
+        if self._transition_task:
+            self._transition_task.cancel()
+            self._transition_task = None
+
+    def _start_transition(self, brightness, transition):
+        """Start stepping through the brightness levels in the background.
+
+        :return: False if there are no levels to pass, the brightness has to be set without transition
+        """
+        steps = self._get_transition_steps(brightness, transition)
+        if not steps:
+            return False
+
+        self._transition_task = self.hass.async_create_task(
+            self._async_run_transition(steps, transition / len(steps), brightness == 0)
+        )
+        return True
+
+    def _get_transition_steps(self, brightness, transition):
+        """Get the levels to pass from the current to the given brightness.
+
+        The number of steps is limited, so that the Light Manager can send each step in time.
+        """
+        # A light that is known to be off starts from zero, whatever brightness it had before
+        if self.is_on is False:
+            start = 0
+        elif self._attr_brightness is None:
+            # Stepping from an unknown brightness would dim the light down first, set the target directly
+            return []
+        else:
+            start = self._attr_brightness
+        target = self._brightness_table[brightness][0] if brightness else 0
+
+        if target >= start:
+            steps = [level for level in self._brightness_levels if start < level[0] <= target]
+        else:
+            steps = [level for level in reversed(self._brightness_levels) if target <= level[0] < start and level[0]]
+
+        max_steps = max(1, int(transition / MIN_TRANSITION_STEP_INTERVAL))
+        if len(steps) > max_steps:
+            # Keep evenly distributed steps including the last one
+            steps = [steps[round((i + 1) * len(steps) / max_steps) - 1] for i in range(max_steps)]
+
+        return steps
+
+    async def _async_run_transition(self, steps, interval, turn_off):
+        """Send the steps of a transition one after another."""
+        try:
+            result = None
+            for level, cmd in steps:
+                result = await self._coordinator.async_send_command(cmd, self._actuator)
+                if result:
+                    self._attr_brightness = level
+                    self.async_write_ha_state()
+                await asyncio.sleep(interval)
+
+            if turn_off:
+                await self._async_call_command(self.hass, command_index=self.COMMAND_OFF, state=False)
+                self._attr_brightness = None
+                self.async_write_ha_state()
+            elif steps and result:
+                self._apply_optimistic_state(steps[-1][1], True, result)
+        except (ConnectionError, HomeAssistantError) as e:
+            _LOGGER.warning("Transition of %s aborted: %s", self.entity_id, e)
+        finally:
+            if self._transition_task is asyncio.current_task():
+                self._transition_task = None
+
+
+class LightManagerAirZoneLight(LightManagerAirBaseEntity, LightEntity):
+    """Representation of all lights of a Light Manager Air zone."""
+
+    def __init__(self, coordinator, zone, members):
+        """Initialize the zone light group."""
+        super().__init__(
+            coordinator=coordinator,
+            command_container=zone,
+            unique_id_suffix=f"{zone.name}_light_group",
+            zone_name=zone.name
+        )
+        self._members = members
+        self._attr_name = f"{zone.name} Lights"
+        self._attr_supported_color_modes = {ColorMode.ONOFF}
+        self._attr_color_mode = ColorMode.ONOFF
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if any member with known state is on."""
+        marker_states = {marker.marker_id: marker.state for marker in self._coordinator.markers}
+        states = []
+        for member in self._members:
+            marker_mapping = member.marker_mapping
+            if marker_mapping is None:
+                continue
+            marker_id, invert = marker_mapping
+            state = marker_states.get(marker_id)
+            if state is not None:
+                states.append(state != invert)
+        return any(states) if states else None
+
+    async def async_turn_on(self, **kwargs):
+        """Turn all lights of the zone on."""
+        await self._async_switch_members(ToggleCommandMixin.COMMAND_ON, True)
+
+    async def async_turn_off(self, **kwargs):
+        """Turn all lights of the zone off."""
+        await self._async_switch_members(ToggleCommandMixin.COMMAND_OFF, False)
+
+    async def async_force_turn_on(self):
+        """Turn all lights of the zone on."""
+        await self.async_turn_on()
+
+    async def async_force_turn_off(self):
+        """Turn all lights of the zone off."""
+        await self.async_turn_off()
+
+    async def _async_switch_members(self, command_index: int, state: bool):
+        """Send the given command of all members as one batch."""
+        members = [member for member in self._members if len(member._actuator.commands) > command_index]
+        commands = [member._actuator.commands[command_index] for member in members]
+        try:
+            await self._coordinator.async_send_commands(commands, [member._actuator for member in members])
+        except ConnectionError as e:
+            raise HomeAssistantError(e)
 
-        await super().async_turn_on(**kwargs)
\ No newline at end of file
+        for member, cmd in zip(members, commands):
+            member._apply_optimistic_state(cmd, state)
@@ -1,64 +1,235 @@
 from __future__ import annotations
 
+import asyncio
+import ipaddress
 import json
 import logging
+import random
 import re
 import socket
 import xml.etree.ElementTree as ET
-from time import time
-from typing import List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from time import monotonic, sleep, time
+from typing import AsyncIterator, List, Optional
 from urllib.parse import urlparse, parse_qsl
 
 import requests
 from requests import Response
+from urllib3.exceptions import NewConnectionError
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class LMRequestError(ConnectionError):
+    """The Light Manager answered, but rejected the request, e.g. because of wrong credentials."""
+
+
+class _LMDiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collects the answers to a discovery broadcast as they arrive."""
+
+    def __init__(self, responses: asyncio.Queue, adapter_ip: str):
+        """
+        :param responses: Queue the answers are put into as tuple of host, device info and adapter IP
+        :param adapter_ip: IP of the network adapter the socket is bound to
+        """
+        self.responses = responses
+        self.adapter_ip = adapter_ip
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        # The own broadcast is received as well
+        if data and data != _LMConnector.DISCOVER_MESSAGE.encode():
+            self.responses.put_nowait((addr[0], data.decode(errors="replace"), self.adapter_ip))
+
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug("Error while receiving discovery answers: %s", exc)
+
+
+class LMRetryPolicy:
+    """Defines how often and when a failed request is sent again."""
+
+    # Failure classes of a request
+    CONNECT = "connect"  # The connection could not be established, the request did not reach the device
+    DISCONNECT = "disconnect"  # The connection broke after it was established, the request may have been executed
+    READ_TIMEOUT = "read_timeout"  # The device did not answer in time, the request may have been executed
+    HTTP = "http"  # The device answered with a server error
+
+    __slots__ = (
+        "attempts",
+        "base_delay",
+        "deadline",
+        "max_delay",
+        "retry_on",
+    )
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float, retry_on: frozenset,
+                 deadline: float = None):
+        """
+        :param attempts: Maximum number of attempts, including the first one.
+        :param base_delay: Seconds of the backoff before the first retry, doubled for each further retry.
+        :param max_delay: Maximum seconds of the backoff.
+        :param retry_on: Failure classes which are retried.
+        :param deadline: Optional. Seconds after the first attempt after which no retry is started anymore.
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.deadline = deadline
+
+    def next_delay(self, attempt: int, failure: str, elapsed: float) -> Optional[float]:
+        """
+        Returns the delay before the next attempt.
+
+        The delay is randomized between zero and the exponential backoff, so that multiple
+        clients do not retry at the same time.
+
+        :param attempt: Number of the failed attempt, starting at 1.
+        :param failure: Failure class of the failed attempt.
+        :param elapsed: Seconds since the first attempt.
+        :return: Delay in seconds or None if the request must not be retried.
+        """
+        if attempt >= self.attempts or failure not in self.retry_on:
+            return None
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
 class _LMConnector:
     """Handles the connection to the Light Manager, including discovery and code polling."""
-    DEFAULT_TIMEOUT = 1000
+    DEFAULT_TIMEOUT = 3000
     COMMAND_KEY = "cmd"
-    RECEIVE_IDENTIFIERS = ["rfhm,", "rfit,"]  # List of valid identifiers
+    RECEIVE_PROTOCOLS = frozenset((b"rfhm", b"rfit"))  # Set of valid radio protocols
     DISCOVER_MESSAGE = "D"
     POLL_ENDPOINT = "/poll.htm"
-
-    def __init__(self, url: str, username: str, password: str, adapter_ip: str = None):
+    CONTROL_ENDPOINT = "/control"
+    BATCH_MAX_COMMANDS = 8  # Maximum number of commands packed into one request
+    _default_adapter_ip: Optional[str] = None  # IP of the default adapter, shared by all connectors
+    RESOLVE_TTL = 300  # Seconds a resolved IP of the host is used
+    # Reading is idempotent, so every failure is retried
+    READ_RETRY_POLICY = LMRetryPolicy(
+        attempts=3, base_delay=0.2, max_delay=2.0,
+        retry_on=frozenset((LMRetryPolicy.CONNECT, LMRetryPolicy.DISCONNECT, LMRetryPolicy.READ_TIMEOUT,
+                            LMRetryPolicy.HTTP))
+    )
+    # Commands like toggles must not be executed twice, so only requests that did not reach the device are retried
+    CONTROL_RETRY_POLICY = LMRetryPolicy(
+        attempts=3, base_delay=0.1, max_delay=1.0, deadline=5.0,
+        retry_on=frozenset((LMRetryPolicy.CONNECT,))
+    )
+    RESOLVE_FAILURE_THRESHOLD = 2  # Number of failed requests in a row after which the host is resolved again
+    RESOLVE_MIN_INTERVAL = 10  # Seconds between two resolutions, doubled after each failed one up to the TTL
+
+    def __init__(self, url: str, username: str, password: str):
         """
         :param url: URL for connecting to Light Manager, e.g., http://lmair
         :param username: LAN username
         :param password: LAN password
-        :param adapter_ip: IP of the desired network adapter
         """
-        self._lm_url = url
-        self._adapter_ip: str = adapter_ip or self._get_default_adapter_ip()
         self._username: str = username
         self._password: str = password
+        self._resolved_url: Optional[str] = None
+        self._resolved_at: Optional[float] = None
+        self._next_resolve_at: Optional[float] = None
+        self._resolve_interval = self.RESOLVE_MIN_INTERVAL
+        self._failures = 0
+        self.read_retry_policy = self.READ_RETRY_POLICY
+        self.control_retry_policy = self.CONTROL_RETRY_POLICY
+        self.request_stats = Counter()
+        self.resolutions = 0
+        self.last_resolve_ms: Optional[float] = None
+        self.url = url
 
-    def receive_radio_signals(self, timeout: int = None) -> list[dict[str, str]]:
-        """Call the /poll.htm endpoint and returns any radio codes found.
+    @property
+    def url(self) -> str:
+        """
+        :return: URL the requests are sent to.
+        """
+        return self._lm_url
+
+    @url.setter
+    def url(self, url: str) -> None:
+        self._lm_url = url
+        parsed_url = urlparse(url)
+        self._host_header = parsed_url.netloc
+        self._hostname = parsed_url.hostname
+        self._resolved_url = None
+        self._resolved_at = None
+        self._next_resolve_at = None
+        self._resolve_interval = self.RESOLVE_MIN_INTERVAL
 
-        :return: List of received radio codes
+        try:
+            ipaddress.ip_address(self._hostname)
+            # No resolution needed
+            self._resolved_url = url
+        except ValueError:
+            pass
+
+    def _request_url(self) -> tuple[str, Optional[dict]]:
+        """Returns the URL with the pinned IP of the host and the headers for a request.
+
+        The host is resolved again after the TTL or after failed requests. If the resolution fails,
+        the last pinned IP is used further and the next resolution is delayed.
+        """
+        if self._resolved_url and self._resolved_at is None:
+            return self._resolved_url, None
+
+        start = monotonic()
+        if ((self._resolved_url is None or start - self._resolved_at > self.RESOLVE_TTL
+                or self._failures >= self.RESOLVE_FAILURE_THRESHOLD)
+                and (self._next_resolve_at is None or start >= self._next_resolve_at)):
+            try:
+                ip = socket.gethostbyname(self._hostname)
+            except OSError as e:
+                _LOGGER.debug("Unable to resolve %s, retrying in %d s: %s", self._hostname, self._resolve_interval, e)
+                self._next_resolve_at = start + self._resolve_interval
+                self._resolve_interval = min(self._resolve_interval * 2, self.RESOLVE_TTL)
+                ip = None
+            finally:
+                self.last_resolve_ms = (monotonic() - start) * 1000
+                self.resolutions += 1
+
+            if ip:
+                self._pin(ip)
+
+        if self._resolved_url is None:
+            # Let the request resolve the host itself
+            return self._lm_url, None
+
+        return self._resolved_url, {"Host": self._host_header}
+
+    def _pin(self, ip: str) -> None:
+        """Sends all further requests to the given IP of the host."""
+        port = urlparse(self._lm_url).port
+        netloc = f"{ip}:{port}" if port else ip
+        self._resolved_url = urlparse(self._lm_url)._replace(netloc=netloc).geturl()
+        self._resolved_at = monotonic()
+        # Failed requests do not resolve the host again right away
+        self._next_resolve_at = self._resolved_at + self.RESOLVE_MIN_INTERVAL
+        self._resolve_interval = self.RESOLVE_MIN_INTERVAL
+        self._failures = 0
+
+    def receive_radio_signals(self, timeout: int = None) -> list[LMRadioFrame]:
+        """Call the /poll.htm endpoint and returns any radio frames found.
+
+        :return: List of received radio frames
         """
-        signals = []
+        frames = []
 
-        response = self.send(self.POLL_ENDPOINT, check_response=False, timeout=timeout)
+        # Polled again after one interval anyway, a retry would only delay the next poll
+        response = self.send(self.POLL_ENDPOINT, retry=False, check_response=False, timeout=timeout)
 
         if response.status_code == 200:
-            data = response.text.strip()
-            if data:
-                for line in data.split('\r'):
-                    line = line.strip()
-                    if not line:
-                        continue
+            for line in response.content.split(b"\r"):
+                frame = LMRadioFrame.decode(line.strip())
+                if frame:
+                    frames.append(frame)
 
-                    for identifier in self.RECEIVE_IDENTIFIERS:
-                        if line.startswith(identifier):
-                            signal = line.split(",")
-                            signals.append({"signal_type": signal[0], "signal_code": signal[1]})
-                            break
-
-        return signals
+        return frames
 
     @staticmethod
     def discover(wait_duration: int = None, discover_adapter_ip: str = None, discover_port: int = None) -> dict:
@@ -74,13 +245,12 @@ class _LMConnector:
         wait_duration = wait_duration or 3
         discover_port = discover_port or 30303
 
-        adapter_ip = discover_adapter_ip or _LMConnector._get_default_adapter_ip()
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
 
         try:
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.bind((adapter_ip, discover_port))
+            _LMConnector._bind_discovery_socket(sock, discover_adapter_ip, discover_port)
             sock.sendto(_LMConnector.DISCOVER_MESSAGE.encode(), ("255.255.255.255", discover_port))
             sock.settimeout(1)
 
@@ -108,12 +278,140 @@ class _LMConnector:
                 pass
             sock.close()
 
+    @staticmethod
+    async def async_discover_iter(wait_duration: float = None, discover_adapter_ip: str = None,
+                                  discover_port: int = None, retransmits: int = 3,
+                                  quiet_time: float = 1.0,
+                                  discover_adapters: dict[str, str] = None) -> AsyncIterator[tuple[str, str, str]]:
+        """
+        Discovers all devices in the local network and yields them as soon as they answer.
+
+        The broadcast is sent on all given network adapters at once and repeated to cope with
+        lost packets. The discovery ends after the wait duration or as soon as no new answer
+        arrived within the quiet time.
+
+        :param wait_duration: Optional. Maximum duration in seconds of waiting for response.
+        :param discover_adapter_ip: Optional. IP of the desired network adapter.
+        :param discover_port: Optional. Broadcast port.
+        :param retransmits: Number of broadcasts, spread over the wait duration.
+        :param quiet_time: Seconds without a new answer after which the discovery ends early. 0 waits the full duration.
+        :param discover_adapters: Optional. Dict with adapter IPs as keys and their broadcast addresses as value.
+                                  Replaces discover_adapter_ip.
+        :return: Yields tuples of host, device info and IP of the adapter the device answered on.
+        """
+        wait_duration = wait_duration or 3
+        discover_port = discover_port or 30303
+        retransmits = max(retransmits, 1)
+
+        loop = asyncio.get_running_loop()
+        responses = asyncio.Queue()
+        transports = []
+
+        if not discover_adapters:
+            discover_adapters = {discover_adapter_ip: "255.255.255.255"}
+
+        for adapter_ip, broadcast_address in discover_adapters.items():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setblocking(False)
+                _LMConnector._bind_discovery_socket(sock, adapter_ip, discover_port)
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda ip=sock.getsockname()[0]: _LMDiscoveryProtocol(responses, ip), sock=sock
+                )
+            except Exception as e:
+                _LOGGER.debug("Unable to discover on adapter %s: %s", adapter_ip, e)
+                sock.close()
+                continue
+            transports.append((transport, broadcast_address))
+
+        if not transports:
+            raise ConnectionError("Unable to auto discover light manager air")
+
+        message = _LMConnector.DISCOVER_MESSAGE.encode()
+        interval = wait_duration / retransmits
+        deadline = loop.time() + wait_duration
+        next_broadcast = loop.time()
+        broadcasts = 0
+        last_answer = None
+        hosts = set()
+
+        try:
+            while True:
+                now = loop.time()
+                if now >= deadline or (quiet_time and last_answer and now - last_answer >= quiet_time):
+                    break
+
+                if broadcasts < retransmits and now >= next_broadcast:
+                    for transport, broadcast_address in transports:
+                        transport.sendto(message, (broadcast_address, discover_port))
+                    broadcasts += 1
+                    next_broadcast += interval
+
+                wake_up = deadline
+                if broadcasts < retransmits:
+                    wake_up = min(wake_up, next_broadcast)
+                if quiet_time and last_answer:
+                    wake_up = min(wake_up, last_answer + quiet_time)
+
+                try:
+                    host, info, adapter_ip = await asyncio.wait_for(responses.get(), max(wake_up - now, 0))
+                except asyncio.TimeoutError:
+                    continue
+
+                last_answer = loop.time()
+                if host not in hosts:
+                    hosts.add(host)
+                    yield host, info, adapter_ip
+        finally:
+            for transport, _ in transports:
+                transport.close()
+
+    @staticmethod
+    async def async_discover(wait_duration: float = None, discover_adapter_ip: str = None,
+                             discover_port: int = None, expected: str = None,
+                             discover_adapters: dict[str, str] = None) -> dict:
+        """
+        Discovers all devices in the local network without blocking.
+
+        :param wait_duration: Optional. Maximum duration in seconds of waiting for response.
+        :param discover_adapter_ip: Optional. IP of the desired network adapter.
+        :param discover_port: Optional. Broadcast port.
+        :param expected: Optional. Host or MAC address, the discovery ends as soon as it answers.
+        :param discover_adapters: Optional. Dict with adapter IPs as keys and their broadcast addresses as value.
+        :return: Returns a dict with IP addresses as keys and device info as value.
+        """
+        expected_mac = re.sub(r"[^0-9a-f]", "", expected.lower()) if expected else None
+        devices = {}
+
+        answers = _LMConnector.async_discover_iter(
+            wait_duration=wait_duration,
+            discover_adapter_ip=discover_adapter_ip,
+            discover_port=discover_port,
+            discover_adapters=discover_adapters
+        )
+        try:
+            async for host, info, _ in answers:
+                devices[host] = info
+                if expected and (host == expected or (
+                        len(expected_mac) == 12 and expected_mac in re.sub(r"[^0-9a-f]", "", info.lower()))):
+                    break
+        finally:
+            # Close the sockets right away when leaving early
+            await answers.aclose()
+
+        return devices
+
     def send(self, path: str, cmd: [str, str] = None, retry: bool = False, check_response: bool = True,
              timeout: int = None) -> Response:
         """Sends a command to the Light Manager.
 
-        :param retry: if true it tries to retry the command once
-        :param timeout: timeout in ms
+        Failed requests are retried according to the retry policy for reading or control requests.
+
+        :param retry: If true, failed requests are retried. Only periodic updates and commands opt in,
+                      so probes of unknown or offline hosts fail fast.
+        :param timeout: timeout in ms per attempt
         :param check_response: If true, the response is checked.
         :param path: Destination path.
         :param cmd: Command list of tuple.
@@ -124,36 +422,116 @@ class _LMConnector:
         if self._username or self._password:
             auth = (self._username, self._password)
 
-        timeout = 3 or (timeout or _LMConnector.DEFAULT_TIMEOUT) / 1000
+        timeout_s = (timeout or _LMConnector.DEFAULT_TIMEOUT) / 1000
 
-        try:
-            if not cmd:
-                response = requests.get(self._lm_url + path, auth=auth, timeout=timeout)
+        policy = (self.control_retry_policy if cmd else self.read_retry_policy) if retry else None
+        request_class = "control" if cmd else "read"
+        started = monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.request_stats[f"{request_class}_attempts"] += 1
+            url, headers = self._request_url()
+            error = None
+
+            try:
+                if not cmd:
+                    response = requests.get(url + path, auth=auth, headers=headers, timeout=timeout_s)
+                else:
+                    response = requests.post(url + path, data=cmd, auth=auth, headers=headers, timeout=timeout_s)
+            except requests.exceptions.ConnectTimeout as e:
+                failure, error = LMRetryPolicy.CONNECT, e
+            except requests.exceptions.ConnectionError as e:
+                failure, error = self._connection_failure(e), e
+            except requests.exceptions.Timeout as e:
+                failure, error = LMRetryPolicy.READ_TIMEOUT, e
+            except Exception as e:
+                failure, error = None, e
             else:
-                response = requests.post(self._lm_url + path, data=cmd, auth=auth, timeout=timeout)
-        except Exception as e:
-            if retry:
-                return self.send(path, cmd, False, check_response, timeout)
-            raise ConnectionError("No answer from light manager air") from e
+                failure = LMRetryPolicy.HTTP if response.status_code >= 500 else None
+
+            if not error and not failure:
+                break
+
+            if error:
+                # Only requests without an answer may be caused by a changed IP
+                self._failures += 1
+            self.request_stats[f"{request_class}_failures_{failure or 'other'}"] += 1
+
+            delay = policy.next_delay(attempt, failure, monotonic() - started) if policy and failure else None
+            if delay is None:
+                if error:
+                    raise ConnectionError("No answer from light manager air") from error
+                # The Light Manager answered, so this is no connection problem
+                raise LMRequestError(f"Request failed with status {response.status_code}")
+
+            _LOGGER.debug("Request to %s failed (%s), attempt %d is started in %.2f s",
+                          path, failure, attempt + 1, delay)
+            sleep(delay)
+
+        self._failures = 0
+        self.request_stats[f"{request_class}_success_attempt_{attempt}"] += 1
 
         if response.status_code == 401:
-            raise ConnectionError("Wrong username or password!")
+            raise LMRequestError("Wrong username or password!")
 
         if check_response and response.reason != "OK":
-            raise ConnectionError(f"Request was not successful! ({response.content.decode()})")
+            raise LMRequestError(f"Request was not successful! ({response.content.decode()})")
 
         return response
 
     @staticmethod
-    def _get_default_adapter_ip():
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    def _connection_failure(error: requests.exceptions.ConnectionError) -> str:
+        """Returns the failure class of a connection error.
+
+        Only errors while connecting are sure not to have reached the device. A connection that
+        was reset or closed after the request was sent may have executed it.
+        """
+        reason = error.args[0] if error.args else None
+        # urllib3 wraps the actual error once its own retries are exhausted
+        reason = getattr(reason, "reason", reason)
+        if isinstance(reason, NewConnectionError):
+            return LMRetryPolicy.CONNECT
+        return LMRetryPolicy.DISCONNECT
+
+    @staticmethod
+    def _bind_discovery_socket(sock: socket.socket, adapter_ip: Optional[str], port: int) -> None:
+        """Binds a discovery socket to the given adapter or else to the default adapter.
+
+        :raises OSError: If the socket could not be bound.
+        """
+        if adapter_ip:
+            sock.bind((adapter_ip, port))
+            return
+
         try:
-            # Use Google's public DNS server to determine the default interface IP
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-        finally:
-            s.close()
-        return ip
+            sock.bind((_LMConnector._get_default_adapter_ip(), port))
+        except OSError:
+            # The default adapter may have changed, e.g. after a network change
+            _LMConnector.invalidate_default_adapter_ip()
+            raise
+
+    @staticmethod
+    def _get_default_adapter_ip() -> str:
+        """Returns the IP of the adapter with the default route, it is determined once per process.
+
+        :raises OSError: If there is no default route.
+        """
+        if _LMConnector._default_adapter_ip is None:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                # Use Google's public DNS server to determine the default interface IP
+                s.connect(("8.8.8.8", 80))
+                _LMConnector._default_adapter_ip = s.getsockname()[0]
+            finally:
+                s.close()
+        return _LMConnector._default_adapter_ip
+
+    @staticmethod
+    def invalidate_default_adapter_ip() -> None:
+        """Forgets the IP of the default adapter, it is determined again on next use."""
+        _LMConnector._default_adapter_ip = None
 
     def load_config(self) -> ET.Element:
         """Loads the config XML from the Light Manager."""
@@ -161,30 +539,34 @@ class _LMConnector:
         try:
             return ET.fromstring(config_response.content.decode())
         except Exception as e:
-            raise ConnectionError("Unable to load config") from e
+            raise LMRequestError("Unable to load config") from e
 
-    def load_params(self) -> dict[str, str]:
-        """Loads the params from the Light Manager."""
-        param_json = self.send("/params.json")
+    def load_params(self, timeout: int = None, retry: bool = False) -> dict[str, str]:
+        """Loads the params from the Light Manager.
+
+        :param timeout: Optional. Timeout in ms.
+        :param retry: Optional. If true, failed requests are retried.
+        """
+        param_json = self.send("/params.json", retry=retry, timeout=timeout)
         try:
             return json.loads(param_json.content.decode())
         except Exception as e:
-            raise ConnectionError("Unable to load params") from e
+            raise LMRequestError("Unable to load params") from e
 
     def load_weather(self) -> dict:
         """Loads the weather data from the Light Manager.
 
         :return: Weather data from weather.json
         """
-        weather_response = self.send("/weather.json")
+        weather_response = self.send("/weather.json", retry=True)
         try:
             return json.loads(weather_response.content.decode())
         except Exception as e:
-            raise ConnectionError("Unable to load weather") from e
+            raise LMRequestError("Unable to load weather") from e
 
     def load_marker_states(self) -> str:
         """Updates the marker states from params.json."""
-        params = self.load_params()
+        params = self.load_params(retry=True)
         return params.get("marker state", "")
 
     @property
@@ -195,6 +577,128 @@ class _LMConnector:
         return self._marker_states
 
 
+class LMRadioFrame:
+    """Describes a decoded radio frame received by the Light Manager."""
+
+    __slots__ = (
+        "command",
+        "device_id",
+        "extra",
+        "protocol",
+        "signal_code",
+        "unit",
+    )
+
+    def __init__(self, protocol: str, signal_code: str, device_id: Optional[str] = None,
+                 unit: Optional[int] = None, command: Optional[str] = None, extra: tuple = ()):
+        """
+        :param protocol: Radio protocol, e.g., rfit.
+        :param signal_code: Received code as sent by the Light Manager.
+        :param device_id: Optional. ID of the sending device.
+        :param unit: Optional. Addressed unit of the sending device.
+        :param command: Optional. Sent command, e.g., on.
+        :param extra: Optional. Additional fields of the frame.
+        """
+        self.protocol = protocol
+        self.signal_code = signal_code
+        self.device_id = device_id
+        self.unit = unit
+        self.command = command
+        self.extra = extra
+
+    @property
+    def code(self) -> str:
+        """
+        :return: Code identifying the button or sensor, e.g., rfit_14734E8A or rfhm_1A2B3C_40.
+        """
+        if self.protocol == "rfhm" and self.command:
+            # HomeMatic messages contain a counter, so the raw code changes with every message
+            return f"{self.protocol}_{self.device_id}_{self.command}"
+        return f"{self.protocol}_{self.signal_code}"
+
+    def as_dict(self) -> dict:
+        """
+        :return: All decoded fields of the frame.
+        """
+        return {
+            "protocol": self.protocol,
+            "signal_code": self.signal_code,
+            "device_id": self.device_id,
+            "unit": self.unit,
+            "command": self.command,
+            "extra": list(self.extra),
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def decode(raw: bytes) -> Optional[LMRadioFrame]:
+        """Decodes a single line of the /poll.htm response.
+
+        The same codes are received over and over again, so decoded frames are cached by their raw line.
+
+        :param raw: Line of the response, e.g., b"rfit,14734E8A".
+        :return: Decoded frame or None if the line is no radio frame.
+        """
+        fields = raw.split(b",")
+        if len(fields) < 2 or fields[0] not in _LMConnector.RECEIVE_PROTOCOLS or not fields[1]:
+            return None
+
+        try:
+            protocol = fields[0].decode()
+            signal_code = fields[1].decode()
+            extra = tuple(field.decode() for field in fields[2:])
+        except UnicodeDecodeError:
+            return None
+
+        if protocol == "rfit":
+            return LMRadioFrame._decode_intertechno(signal_code, extra)
+        return LMRadioFrame._decode_homematic(signal_code, extra)
+
+    @staticmethod
+    def _decode_intertechno(signal_code: str, extra: tuple) -> LMRadioFrame:
+        """Decodes a self-learning Intertechno code.
+
+        The 32 bit code consists of a 26 bit device ID, a group bit, a command bit and a 4 bit unit.
+        Other codes are only passed through.
+        """
+        if len(signal_code) != 8:
+            return LMRadioFrame("rfit", signal_code, device_id=signal_code, extra=extra)
+
+        try:
+            value = int(signal_code, 16)
+        except ValueError:
+            return LMRadioFrame("rfit", signal_code, device_id=signal_code, extra=extra)
+
+        group = bool(value >> 5 & 1)
+        return LMRadioFrame(
+            "rfit",
+            signal_code,
+            device_id=f"{value >> 6:07X}",
+            unit=None if group else value & 0xF,
+            command="on" if value >> 4 & 1 else "off",
+            extra=extra,
+        )
+
+    @staticmethod
+    def _decode_homematic(signal_code: str, extra: tuple) -> LMRadioFrame:
+        """Decodes a HomeMatic message.
+
+        A message consists of length, counter, flags, type, 3 byte sender, 3 byte receiver and payload.
+        The sender is used as device ID, the message type as command.
+        Other codes are only passed through.
+        """
+        if len(signal_code) < 20:
+            return LMRadioFrame("rfhm", signal_code, device_id=signal_code, extra=extra)
+
+        return LMRadioFrame(
+            "rfhm",
+            signal_code,
+            device_id=signal_code[8:14],
+            command=signal_code[6:8],
+            extra=(signal_code[14:20], signal_code[20:]) + extra,
+        )
+
+
 class _LMFixture:
     """Base class for all Light Manager fixtures."""
 
@@ -238,6 +742,12 @@ class _LMCommandContainer(_LMFixture):
 
 class LMCommand(_LMFixture):
     """Describes a callable command."""
+    MARKER_PATTERN = re.compile(r"typ,smk,(\d+),([012])")
+    URL_PATTERN = re.compile(r"https?://[^\s,{]+")
+    HOST_PATTERN = re.compile(r"\b(\d{1,3}(?:\.\d{1,3}){3})(?:[:,](\d{1,5}))?\b")
+    PATH_PATTERN = re.compile(r"(?<![\w.])(/[^\s,{]*)")
+    BODY_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+    HUE_PATTERN = re.compile(r"/api/[^/]+/(?:lights|groups)/\d+/(?:state|action)")
 
     def __init__(self, connector: _LMConnector,
                  name: Optional[str] = None,
@@ -273,6 +783,35 @@ class LMCommand(_LMFixture):
         """
         return self._cmd
 
+    @property
+    def params(self) -> List[tuple[str, str]]:
+        """
+        :return: Param data of the command as list of tuples.
+        """
+        if isinstance(self._cmd, tuple):
+            return [self._cmd]
+        return self._cmd
+
+    @property
+    def marker_action(self) -> Optional[tuple[int, int]]:
+        """
+        :return: Marker ID and action (0 = off, 1 = on, 2 = toggle) if this command sets a marker.
+        """
+        for key, value in self.params:
+            if key == _LMConnector.COMMAND_KEY:
+                result = self.MARKER_PATTERN.fullmatch(value)
+                if result:
+                    return int(result.group(1)), int(result.group(2))
+        return None
+
+    @property
+    def is_toggle(self) -> bool:
+        """
+        :return: True if this command toggles a marker, so its effect depends on the current state.
+        """
+        action = self.marker_action
+        return action is not None and action[1] == 2
+
     def call(self) -> None:
         """
         Starts the command on the Light Manager.
@@ -283,7 +822,47 @@ class LMCommand(_LMFixture):
         else:
             cmd_dict = dict(self._cmd)
         
-        self._connector.send("/control", cmd=cmd_dict, retry=True)
+        self._connector.send(_LMConnector.CONTROL_ENDPOINT, cmd=cmd_dict, retry=True)
+
+    @property
+    def http_request(self) -> Optional[tuple[str, str, Optional[str]]]:
+        """Extracts the HTTP request the Light Manager sends for this command, e.g., for Philips Hue.
+
+        :return: Tuple with method, URL and body or None if this is no HTTP command.
+        """
+        for key, value in self.params:
+            if key != _LMConnector.COMMAND_KEY:
+                continue
+
+            body = self.BODY_PATTERN.search(value)
+            body = body.group(0) if body else None
+            target = value[:value.index(body)] if body else value
+
+            url = self.URL_PATTERN.search(target)
+            if url:
+                url = url.group(0)
+            else:
+                host = self.HOST_PATTERN.search(target)
+                path = self.PATH_PATTERN.search(target[host.end():]) if host else None
+                if not path:
+                    continue
+                port = f":{host.group(2)}" if host.group(2) else ""
+                url = f"http://{host.group(1)}{port}{path.group(1)}"
+
+            if self.HUE_PATTERN.search(url):
+                method = "PUT"
+            else:
+                method = "POST" if body else "GET"
+            return method, url, body
+        return None
+
+    @property
+    def packable(self) -> bool:
+        """
+        :return: True if the command consists of a single cmd param and can be packed with other commands.
+        """
+        params = self.params
+        return len(params) == 1 and params[0][0] == _LMConnector.COMMAND_KEY
 
 
 class LMActuator(_LMCommandContainer):
@@ -337,6 +916,13 @@ class LMMarker(_LMCommandContainer):
         """
         return self._state
 
+    @state.setter
+    def state(self, state: bool):
+        """
+        :param state: New state of the marker, e.g., after a marker command was sent.
+        """
+        self._state = state
+
 
 class LMWeatherChannel(_LMFixture):
     """Describes a weather channel."""
@@ -424,8 +1010,13 @@ class LMZone(_LMFixture):
 
 class LMAir(_LMFixture):
     """Handles communication with the JB Media Light Manager Air."""
+    MAC_PATTERN = re.compile(r"\b[0-9A-Fa-f]{2}(?:[:-][0-9A-Fa-f]{2}){5}\b")
+    LOGIN_PATTERN = re.compile(r"Login[ :](.+?)\r\n")
+    PASS_PATTERN = re.compile(r"Pass[ :](.+?)\r\n")
+    DISCOVER_PROBE_TIMEOUT = 1000  # Timeout in ms for loading the params of discovered devices
+    DISCOVER_MAX_WORKERS = 8  # Maximum number of discovered devices probed in parallel
 
-    def __init__(self, url: str, username: str = None, password: str = None, adapter_ip: str = None):
+    def __init__(self, url: str, username: str = None, password: str = None, timeout: int = None):
         """
         Initiates a new LMAir instance with given data. Only url is mandatory.
         If username, password, or info is not given, it will be loaded from the device.
@@ -433,7 +1024,7 @@ class LMAir(_LMFixture):
         :param url: URL for connecting to Light Manager, e.g., http://lmair.
         :param username: Optional. LAN username.
         :param password: Optional. LAN password.
-        :param adapter_ip: Optional. IP of the network adapter connected to Light Manager.
+        :param timeout: Optional. Timeout in ms for loading the initial params.
         """
         super().__init__("Light Manager Air")
 
@@ -449,11 +1040,14 @@ class LMAir(_LMFixture):
         self._lm_url = parsed_url.scheme + "://" + self._lm_hostname
         self._username = username
         self._password = password
-        self._connector = _LMConnector(self._lm_url, self._username, self._password, adapter_ip=adapter_ip)
+        self._connector = _LMConnector(self._lm_url, self._username, self._password)
         self._config = None
+        self._batch_supported = False
+        self._scene_index: dict[frozenset, LMCommand] = {}
 
         # Load initial params
-        params = self._connector.load_params()
+        params = self._connector.load_params(timeout)
+        self._initial_marker_states = params.get("marker state", "")
         self._mac_address = params["mac addr"]
         self._fw_version = params["firmware ver"]
         self._ssid = params["ssid"]
@@ -486,6 +1080,51 @@ class LMAir(_LMFixture):
         """
         return self._lm_hostname
 
+    @property
+    def connection_stats(self) -> dict:
+        """
+        :return: Statistics of the requests and the host name resolution.
+        """
+        return {
+            **self._connector.request_stats,
+            "host_resolutions": self._connector.resolutions,
+            "host_last_resolve_ms": self._connector.last_resolve_ms,
+        }
+
+    def probe(self, timeout: int = None) -> None:
+        """
+        Checks with a single request if the Light Manager answers.
+
+        :param timeout: Optional. Timeout in ms.
+        :raises ConnectionError: If the Light Manager does not answer.
+        :raises LMRequestError: If the Light Manager answers, but rejects the request.
+        """
+        self._connector.send("/params.json", retry=False, timeout=timeout)
+
+    def update_host(self, host: str) -> None:
+        """
+        Changes the host of the Light Manager, e.g., after it got a new IP address.
+
+        :param host: New host of the Light Manager.
+        """
+        self._lm_hostname = host
+        self._lm_url = urlparse(self._lm_url)._replace(netloc=host).geturl()
+        self._connector.url = self._lm_url
+
+    @staticmethod
+    def identify(host: str, username: str = None, password: str = None, timeout: int = None) -> str:
+        """
+        Loads the MAC address of the Light Manager at the given host.
+
+        :param host: Host to identify.
+        :param username: Optional. LAN username.
+        :param password: Optional. LAN password.
+        :param timeout: Optional. Timeout in ms.
+        :return: MAC address of the Light Manager.
+        """
+        connector = _LMConnector(f"http://{host}", username, password)
+        return connector.load_params(timeout)["mac addr"]
+
     @property
     def fw_version(self):
         """
@@ -517,24 +1156,87 @@ class LMAir(_LMFixture):
             discover_port=discover_port
         )
 
-        def get_info_value(info: str, key: str) -> Optional[str]:
-            pattern = re.compile(rf"{key}[ :](.+?)\r\n")
+        def get_info_value(info: str, pattern: re.Pattern) -> Optional[str]:
             result = pattern.search(info)
             if not result:
                 return None
             return result.group(1).strip()
 
-        return [LMAir(
-            host,
-            username=get_info_value(info, "Login"),
-            password=get_info_value(info, "Pass"),
-            adapter_ip=discover_adapter_ip
-        ) for host, info in devices.items()]
+        def probe(host: str, info: str) -> Optional[LMAir]:
+            try:
+                return LMAir(
+                    host,
+                    username=get_info_value(info, LMAir.LOGIN_PATTERN),
+                    password=get_info_value(info, LMAir.PASS_PATTERN),
+                    timeout=LMAir.DISCOVER_PROBE_TIMEOUT
+                )
+            except ConnectionError as e:
+                _LOGGER.debug("Discovered device %s did not answer: %s", host, e)
+                return None
+
+        if not devices:
+            return []
+
+        # Probe all devices at once, so that unreachable devices do not delay the others
+        with ThreadPoolExecutor(max_workers=min(len(devices), LMAir.DISCOVER_MAX_WORKERS)) as executor:
+            results = executor.map(lambda item: probe(*item), devices.items())
+            return [light_manager for light_manager in results if light_manager]
+
+    @staticmethod
+    async def async_discover_iter(wait_duration: float = None, discover_adapter_ip: str = None,
+                                  discover_port: int = None, discover_adapters: dict[str, str] = None
+                                  ) -> AsyncIterator[tuple[str, Optional[str], str]]:
+        """
+        Discovers all devices in the local network and yields them as soon as they answer.
+
+        :param wait_duration: Optional. Maximum duration in seconds of waiting for response.
+        :param discover_adapter_ip: Optional. IP of the desired network adapter.
+        :param discover_port: Optional. Broadcast port.
+        :param discover_adapters: Optional. Dict with adapter IPs as keys and their broadcast addresses as value.
+        :return: Yields tuples of host, MAC address if the answer contains it and IP of the adapter it answered on.
+        """
+        answers = _LMConnector.async_discover_iter(
+            wait_duration=wait_duration,
+            discover_adapter_ip=discover_adapter_ip,
+            discover_port=discover_port,
+            discover_adapters=discover_adapters
+        )
+        try:
+            async for host, info, adapter_ip in answers:
+                mac = LMAir.MAC_PATTERN.search(info)
+                yield host, mac.group(0).upper().replace("-", ":") if mac else None, adapter_ip
+        finally:
+            await answers.aclose()
+
+    @staticmethod
+    async def async_discover(wait_duration: float = None, discover_adapter_ip: str = None,
+                             discover_port: int = None, expected: str = None,
+                             discover_adapters: dict[str, str] = None) -> List[str]:
+        """
+        Discovers all devices in the local network without blocking.
+
+        In contrast to discover, no connection to the found devices is established.
+
+        :param wait_duration: Optional. Maximum duration in seconds of waiting for response.
+        :param discover_adapter_ip: Optional. IP of the desired network adapter.
+        :param discover_port: Optional. Broadcast port.
+        :param expected: Optional. Host or MAC address, the discovery ends as soon as it answers.
+        :param discover_adapters: Optional. Dict with adapter IPs as keys and their broadcast addresses as value.
+        :return: List of hosts.
+        """
+        devices = await _LMConnector.async_discover(
+            wait_duration=wait_duration,
+            discover_adapter_ip=discover_adapter_ip,
+            discover_port=discover_port,
+            expected=expected,
+            discover_adapters=discover_adapters
+        )
+        return list(devices)
 
-    def load_radio_signals(self, timeout: int = None) -> list[dict[str, str]]:
-        """Polls the /poll.htm endpoint once and returns any radio codes found.
+    def load_radio_signals(self, timeout: int = None) -> List[LMRadioFrame]:
+        """Polls the /poll.htm endpoint once and returns any radio frames found.
 
-        :return: List of received radio codes
+        :return: List of received radio frames
         """
         return self._connector.receive_radio_signals(timeout)
 
@@ -547,16 +1249,62 @@ class LMAir(_LMFixture):
             self._config = self._connector.load_config()
 
         zones = [LMZone(zone, self._connector) for zone in self._config.findall("./zone")]
-        scenes = [LMCommand(self._connector, config=scene) for scene in self._config.findall("./lightscenes/scene")]
+        scene_configs = self._config.findall("./lightscenes/scene")
+        scenes = [LMCommand(self._connector, config=scene) for scene in scene_configs]
+        self._scene_index = self._build_scene_index(scene_configs, scenes)
         return zones, scenes
 
+    @staticmethod
+    def _build_scene_index(scene_configs: List[ET.Element], scenes: List[LMCommand]) -> dict[frozenset, LMCommand]:
+        """Builds an index of all scenes by the set of commands they consist of.
+
+        Scenes which only reference a scene stored on the device (cmd=idx,...) cannot be indexed.
+
+        :param scene_configs: Scene parts of the config.xml.
+        :param scenes: Scenes created from the given configs.
+        :return: Dict with the set of command payloads as key and the scene as value.
+        """
+        index = {}
+        for config, scene in zip(scene_configs, scenes):
+            payloads = [value for key, value in scene.params
+                        if key == _LMConnector.COMMAND_KEY and not value.startswith("idx,")]
+            for param in config.findall("./commandlist/command/param"):
+                payloads.extend(value for key, value in parse_qsl(param.text or "")
+                                if key == _LMConnector.COMMAND_KEY)
+
+            if len(payloads) > 1:
+                index.setdefault(frozenset(payloads), scene)
+        return index
+
+    def plan_commands(self, commands: List[LMCommand]) -> List[LMCommand]:
+        """Replaces a set of commands by a scene consisting of exactly these commands.
+
+        :param commands: Commands to send.
+        :return: List with the matching scene or the given commands if there is no such scene.
+        """
+        if len(commands) > 1 and self._scene_index and all(command.packable for command in commands):
+            scene = self._scene_index.get(frozenset(command.params[0][1] for command in commands))
+            if scene:
+                _LOGGER.debug("Sending scene %s instead of %d commands", scene.name, len(commands))
+                return [scene]
+        return commands
+
     def load_markers(self) -> List[LMMarker]:
         """Loads all markers.
 
         :return: List of all markers
         """
-        marker_states = self._connector.load_marker_states()
+        return self._create_markers(self._connector.load_marker_states())
 
+    @property
+    def initial_markers(self) -> List[LMMarker]:
+        """
+        :return: Markers with the states loaded on creation of this instance, without another request.
+        """
+        return self._create_markers(self._initial_marker_states)
+
+    def _create_markers(self, marker_states: str) -> List[LMMarker]:
+        """Creates the markers from the marker states of the params."""
         markers = []
         if marker_states:
             for i, state in enumerate(marker_states):
@@ -589,9 +1337,82 @@ class LMAir(_LMFixture):
 
         return channels
 
+    @property
+    def batch_supported(self) -> bool:
+        """
+        :return: True if multiple commands are packed into one request.
+        """
+        return self._batch_supported
+
+    @batch_supported.setter
+    def batch_supported(self, batch_supported: bool) -> None:
+        """
+        :param batch_supported: True if the firmware accepts multiple commands per request.
+        """
+        self._batch_supported = batch_supported
+
+    def send_commands(self, commands: List[LMCommand]) -> List[LMCommand]:
+        """Sends multiple commands with as few requests as possible.
+
+        If the commands match a scene exactly, the scene is sent instead.
+        If the firmware does not accept multiple commands per request, the commands are sent one by one.
+        A rejected packed request is sent again one by one and packing is turned off.
+
+        :param commands: Commands to send in the given order.
+        :return: The commands actually sent.
+        """
+        commands = self.plan_commands(commands)
+
+        if not self._batch_supported:
+            for command in commands:
+                command.call()
+            return commands
+
+        batch = []
+        for command in commands:
+            if not command.packable:
+                self._send_batch(batch)
+                batch = []
+                command.call()
+                continue
+
+            batch.append(command)
+            if len(batch) >= _LMConnector.BATCH_MAX_COMMANDS:
+                self._send_batch(batch)
+                batch = []
+
+        self._send_batch(batch)
+        return commands
+
+    def _send_batch(self, commands: List[LMCommand]) -> None:
+        """Sends packable commands with a single request, or one by one if packing is not supported."""
+        if len(commands) == 1 or not self._batch_supported:
+            for command in commands:
+                command.call()
+        elif commands:
+            params = [param for command in commands for param in command.params]
+            try:
+                self._connector.send(_LMConnector.CONTROL_ENDPOINT, cmd=params, retry=True)
+            except LMRequestError as e:
+                # Raises as well if the commands are rejected for another reason, e.g. wrong credentials
+                commands[0].call()
+                _LOGGER.warning("Light Manager does not accept packed commands, sending them one by one: %s", e)
+                self._batch_supported = False
+                for command in commands[1:]:
+                    command.call()
+
+    def create_command(self, command: str, name: str = "custom_command") -> LMCommand:
+        """Creates a custom command without sending it.
+
+        :param command: Command (e.g., 'typ,it,did,0996,aid,215,acmd,0,seq,6').
+        :param name: Optional. Name of the command.
+        :return: Callable command.
+        """
+        return LMCommand(self._connector, name=name, cmd=command)
+
     def send_command(self, command: Optional[str]):
         """Sends a custom command.
 
         :param command: Command to send (e.g., 'typ,it,did,0996,aid,215,acmd,0,seq,6').
         """
-        LMCommand(self._connector, name="custom_command", cmd=command).call()
+        self.create_command(command).call()
@@ -0,0 +1,87 @@
+"""Local radio code to command bindings for Light Manager Air."""
+from __future__ import annotations
+
+import logging
+from typing import List, Optional
+
+from .const import (
+    CONF_ACTUATOR_NAME,
+    CONF_BINDING_EVENT,
+    CONF_COMMAND,
+    CONF_COMMAND_NAME,
+    CONF_MARKER_ID,
+    CONF_RADIO_CODE,
+    CONF_SCENE,
+    CONF_ZONE_NAME,
+    MARKER_ACTIONS,
+)
+from .lmair import LMAir, LMCommand, LMZone
+
+_LOGGER = logging.getLogger(__name__)
+
+RadioBindings = dict[tuple[str, str], List[LMCommand]]
+
+
+def _find_command(commands: List[LMCommand], command_name: str) -> Optional[LMCommand]:
+    """Find a command by its exact name, or else by a partial name."""
+    command_name = command_name.lower()
+    for cmd in commands:
+        if cmd.name.lower() == command_name:
+            return cmd
+    for cmd in commands:
+        if command_name in cmd.name.lower():
+            return cmd
+    return None
+
+
+def _resolve_binding(binding: dict, light_manager: LMAir, zones: List[LMZone],
+                     scenes: List[LMCommand]) -> Optional[LMCommand]:
+    """Resolve the target of a single binding to a command."""
+    if CONF_COMMAND in binding:
+        return light_manager.create_command(binding[CONF_COMMAND], name=binding[CONF_RADIO_CODE])
+
+    if CONF_SCENE in binding:
+        return next((scene for scene in scenes if scene.name == binding[CONF_SCENE]), None)
+
+    command_name = binding.get(CONF_COMMAND_NAME, "toggle")
+
+    if CONF_MARKER_ID in binding:
+        action = MARKER_ACTIONS.get(command_name.lower())
+        if action is None:
+            return None
+        return light_manager.create_command(
+            f"typ,smk,{binding[CONF_MARKER_ID] - 1},{action}",
+            name=f"Marker {binding[CONF_MARKER_ID]} {command_name}"
+        )
+
+    for zone in zones:
+        if CONF_ZONE_NAME in binding and zone.name != binding[CONF_ZONE_NAME]:
+            continue
+        for actuator in zone.actuators:
+            if actuator.name == binding[CONF_ACTUATOR_NAME]:
+                return _find_command(actuator.commands, command_name)
+    return None
+
+
+def build_radio_bindings(bindings: List[dict], light_manager: LMAir, zones: List[LMZone],
+                         scenes: List[LMCommand]) -> RadioBindings:
+    """Build the lookup table of all configured radio bindings.
+
+    :param bindings: Configured bindings
+    :param light_manager: Light Manager the commands are sent to
+    :param zones: Zones of the Light Manager
+    :param scenes: Scenes of the Light Manager
+    :return: Dict with (code, event type) as key and the commands to send as value
+    """
+    table: RadioBindings = {}
+
+    for binding in bindings:
+        command = _resolve_binding(binding, light_manager, zones, scenes)
+        if command is None:
+            _LOGGER.warning("Target of radio binding for %s not found, binding ignored", binding[CONF_RADIO_CODE])
+            continue
+
+        key = (binding[CONF_RADIO_CODE], binding[CONF_BINDING_EVENT])
+        table.setdefault(key, []).append(command)
+
+    return table
@@ -0,0 +1,128 @@
+"""Registry of known radio codes for Light Manager Air."""
+from __future__ import annotations
+
+import logging
+from typing import Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_RADIO_CODE,
+    CONF_RADIO_CODE_NAME,
+    CONF_RADIO_CODES,
+    DOMAIN,
+    MAX_LEARNED_RADIO_CODES,
+    STORAGE_KEY_RADIO_CODES,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 10
+
+RadioCodeListener = Callable[[str, dict], None]
+
+
+class RadioCodeRegistry:
+    """Keeps track of learned radio codes and routes their events to listeners."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the registry.
+
+        :param hass: Home Assistant instance
+        :param entry_id: ID of the config entry the registry belongs to
+        """
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_RADIO_CODES}_{entry_id}")
+        self._learned: dict[str, Optional[str]] = {}
+        self._named: dict[str, str] = {}
+        self._listeners: dict[str, list[RadioCodeListener]] = {}
+        self._global_listeners: list[RadioCodeListener] = []
+        self._new_code_callback: Optional[Callable[[str], None]] = None
+
+    async def async_load(self) -> None:
+        """Load learned codes from storage and named codes from the configuration."""
+        try:
+            stored_data = await self._store.async_load()
+            if stored_data and isinstance(stored_data, dict):
+                self._learned = dict.fromkeys(stored_data.get("codes", []))
+        except Exception as err:
+            _LOGGER.error("Error loading learned radio codes: %s", err)
+
+        for entry in self._hass.data[DOMAIN].get(CONF_RADIO_CODES, []):
+            self._named[entry[CONF_RADIO_CODE]] = entry[CONF_RADIO_CODE_NAME]
+
+    @property
+    def codes(self) -> list[str]:
+        """Return all known codes, named codes first."""
+        return list(self._named) + [code for code in self._learned if code not in self._named]
+
+    def name(self, code: str) -> Optional[str]:
+        """Return the user defined name of a code."""
+        return self._named.get(code)
+
+    def is_named(self, code: str) -> bool:
+        """Return if the code was named by the user."""
+        return code in self._named
+
+    @callback
+    def async_set_new_code_callback(self, new_code_callback: Optional[Callable[[str], None]]) -> None:
+        """Set the callback that is called when a new code was learned."""
+        self._new_code_callback = new_code_callback
+
+    @callback
+    def async_observe(self, code: str) -> None:
+        """Learn a received code if it is not known yet."""
+        if code in self._named or code in self._learned:
+            return
+
+        if len(self._learned) >= MAX_LEARNED_RADIO_CODES:
+            _LOGGER.debug("Maximum of learned radio codes reached, ignoring %s", code)
+            return
+
+        _LOGGER.debug("Learned new radio code %s", code)
+        self._learned[code] = None
+        self._store.async_delay_save(lambda: {"codes": list(self._learned)}, SAVE_DELAY)
+
+        if self._new_code_callback:
+            self._new_code_callback(code)
+
+    @property
+    def has_listeners(self) -> bool:
+        """Return if any entity listens for radio events."""
+        return bool(self._listeners or self._global_listeners)
+
+    @callback
+    def async_listen_all(self, listener: RadioCodeListener) -> Callable[[], None]:
+        """Listen for events of all codes.
+
+        :return: Function to remove the listener
+        """
+        self._global_listeners.append(listener)
+        return lambda: self._global_listeners.remove(listener)
+
+    @callback
+    def async_listen(self, code: str, listener: RadioCodeListener) -> Callable[[], None]:
+        """Listen for events of a single code.
+
+        :return: Function to remove the listener
+        """
+        listeners = self._listeners.setdefault(code, [])
+        listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(code, None)
+
+        return remove_listener
+
+    @callback
+    def async_dispatch(self, code: str, event_type: str, data: dict) -> None:
+        """Route an event to the listeners of its code."""
+        for listener in self._global_listeners:
+            listener(event_type, data)
+        for listener in self._listeners.get(code, ()):
+            listener(event_type, data)
@@ -39,6 +39,6 @@ class LightManagerAirScene(Scene):
     async def async_activate(self, **kwargs) -> None:
         """Activate the scene."""
         try:
-            await self.hass.async_add_executor_job(self._scene.call)
+            await self._coordinator.async_send_command(self._scene, self._scene)
         except ConnectionError as e:
             raise HomeAssistantError(e)
\ No newline at end of file
@@ -0,0 +1,88 @@
+import unittest
+
+from custom_components.light_manager_air.helpers.commandqueue import CommandQueue
+
+
+class CommandQueueTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.queue = CommandQueue(ttl=30, max_size=3)
+
+    async def _send(self, command):
+        self.sent.append(command)
+
+    async def test_newer_command_replaces_queued_one(self):
+        self.queue.put("light", "on", self._send, 0)
+        self.queue.put("light", "off", self._send, 1)
+
+        await self.queue.async_drain(2)
+
+        self.assertEqual(self.sent, ["off"])
+        self.assertEqual(self.queue.superseded, 1)
+        self.assertEqual(self.queue.replayed, 1)
+
+    async def test_toggle_is_kept_behind_absolute_command(self):
+        self.queue.put("light", "on", self._send, 0)
+        self.queue.put("light", "toggle", self._send, 0, relative=True)
+
+        self.assertEqual(len(self.queue), 2)
+        await self.queue.async_drain(1)
+
+        self.assertEqual(self.sent, ["on", "toggle"])
+
+    async def test_queued_toggles_cancel_out(self):
+        self.queue.put("light", "toggle", self._send, 0, relative=True)
+        self.queue.put("light", "toggle", self._send, 0, relative=True)
+
+        self.assertEqual(len(self.queue), 0)
+        self.queue.put("light", "toggle", self._send, 0, relative=True)
+        await self.queue.async_drain(1)
+
+        self.assertEqual(self.sent, ["toggle"])
+
+    async def test_commands_expire_after_ttl(self):
+        self.queue.put("light", "on", self._send, 0)
+        self.queue.put("cover", "up", self._send, 20)
+
+        await self.queue.async_drain(40)
+
+        self.assertEqual(self.sent, ["up"])
+        self.assertEqual(self.queue.expired, 1)
+
+    async def test_oldest_target_is_dropped_when_full(self):
+        for target in ("a", "b", "c", "d"):
+            self.queue.put(target, f"{target}_on", self._send, 0)
+
+        self.assertEqual(list(self.queue), ["b", "c", "d"])
+        self.assertEqual(self.queue.overflowed, 1)
+
+    async def test_failed_command_stays_queued(self):
+        async def fail(command):
+            raise ConnectionError("No answer")
+
+        self.queue.put("light", "on", fail, 0)
+        self.queue.put("cover", "up", self._send, 0)
+
+        with self.assertRaises(ConnectionError):
+            await self.queue.async_drain(1)
+
+        self.assertEqual(list(self.queue), ["light", "cover"])
+        self.assertEqual(self.sent, [])
+
+    async def test_rejected_command_is_dropped(self):
+        async def reject(command):
+            raise ValueError("Rejected")
+
+        self.queue.put("light", "on", reject, 0)
+        self.queue.put("cover", "up", self._send, 0)
+
+        await self.queue.async_drain(1, discard_on=(ValueError,))
+
+        self.assertEqual(self.sent, ["up"])
+        self.assertEqual(self.queue.rejected, 1)
+        self.assertEqual(len(self.queue), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
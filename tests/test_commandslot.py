@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+
+from custom_components.light_manager_air.helpers.commandslot import CommandSlot
+
+
+class CommandSlotTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.sent = []
+
+    def _sender(self, way):
+        async def send(command):
+            await asyncio.sleep(0)
+            self.sent.append((way, command))
+            return way
+        return send
+
+    async def test_newer_command_replaces_pending_one(self):
+        slot = CommandSlot()
+        hub = self._sender("hub")
+
+        results = await asyncio.gather(
+            slot.async_submit("on", hub),
+            slot.async_submit("dim", hub),
+            slot.async_submit("off", hub),
+        )
+
+        self.assertEqual(results, [False, False, "hub"])
+        self.assertEqual(self.sent, [("hub", "off")])
+
+    async def test_toggle_is_queued_behind_absolute_command(self):
+        slot = CommandSlot()
+        hub = self._sender("hub")
+
+        results = await asyncio.gather(
+            slot.async_submit("on", hub),
+            slot.async_submit("toggle", hub, relative=True),
+        )
+
+        self.assertEqual(results, ["hub", "hub"])
+        self.assertEqual(self.sent, [("hub", "on"), ("hub", "toggle")])
+
+    async def test_pending_toggles_cancel_out(self):
+        slot = CommandSlot()
+        hub = self._sender("hub")
+
+        results = await asyncio.gather(*(
+            slot.async_submit(f"toggle{i}", hub, relative=True) for i in range(3)
+        ))
+
+        self.assertEqual(results, [False, False, "hub"])
+        self.assertEqual(self.sent, [("hub", "toggle2")])
+
+    async def test_absolute_command_replaces_pending_toggles(self):
+        slot = CommandSlot()
+        hub = self._sender("hub")
+
+        results = await asyncio.gather(
+            slot.async_submit("toggle", hub, relative=True),
+            slot.async_submit("off", hub),
+        )
+
+        self.assertEqual(results, [False, "hub"])
+        self.assertEqual(self.sent, [("hub", "off")])
+
+    async def test_send_error_is_raised_to_the_caller(self):
+        slot = CommandSlot()
+
+        async def fail(command):
+            raise ConnectionError("No answer")
+
+        with self.assertRaises(ConnectionError):
+            await slot.async_submit("on", fail)
+        self.assertEqual(await slot.async_submit("off", self._sender("hub")), "hub")
+
+    async def test_each_command_uses_its_own_send_function(self):
+        slot = CommandSlot()
+        direct, hub = self._sender("direct"), self._sender("hub")
+
+        results = await asyncio.gather(
+            slot.async_submit("http", direct),
+            slot.async_submit("toggle", hub, relative=True),
+        )
+
+        self.assertEqual(results, ["direct", "hub"])
+        self.assertEqual(self.sent, [("direct", "http"), ("hub", "toggle")])
+
+    async def test_queued_command_after_running_one_uses_its_own_send_function(self):
+        slot = CommandSlot()
+        direct, hub = self._sender("direct"), self._sender("hub")
+
+        first = asyncio.create_task(slot.async_submit("http", direct))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(first, slot.async_submit("marker", hub))
+
+        self.assertEqual(results, ["direct", "hub"])
+        self.assertEqual(self.sent, [("direct", "http"), ("hub", "marker")])
+
+    async def test_flush_drops_pending_and_waits_for_running_command(self):
+        slot = CommandSlot()
+        hub = self._sender("hub")
+
+        running = asyncio.create_task(slot.async_submit("on", hub))
+        await asyncio.sleep(0)
+        pending = asyncio.create_task(slot.async_submit("dim", hub))
+        await asyncio.sleep(0)
+        await slot.async_flush()
+
+        self.assertEqual(self.sent, [("hub", "on")])
+        self.assertEqual(await asyncio.gather(running, pending), ["hub", False])
+
+
+if __name__ == '__main__':
+    unittest.main()
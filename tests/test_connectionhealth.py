@@ -0,0 +1,58 @@
+import unittest
+
+from custom_components.light_manager_air.helpers.connectionhealth import ConnectionHealth, HealthState
+
+
+class ConnectionHealthTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.health = ConnectionHealth(failure_threshold=3, min_probe_interval=5, max_probe_interval=20)
+
+    def test_opens_after_threshold(self):
+        self.assertTrue(self.health.record_failure(0))
+        self.assertIs(self.health.state, HealthState.DEGRADED)
+        self.assertFalse(self.health.record_failure(1))
+        self.assertFalse(self.health.is_open)
+
+        self.assertTrue(self.health.record_failure(2))
+        self.assertTrue(self.health.is_open)
+        self.assertEqual(self.health.next_probe_at, 7)
+
+    def test_failed_probes_back_off(self):
+        for now in range(3):
+            self.health.record_failure(now)
+
+        # Probes while open, each failure doubles the interval up to the maximum
+        self.assertFalse(self.health.record_failure(7))
+        self.assertEqual(self.health.next_probe_at, 17)
+        self.health.record_failure(17)
+        self.assertEqual(self.health.next_probe_at, 37)
+        self.health.record_failure(37)
+        self.assertEqual(self.health.next_probe_at, 57)
+        self.assertTrue(self.health.is_open)
+
+    def test_success_closes(self):
+        for now in range(3):
+            self.health.record_failure(now)
+
+        self.assertTrue(self.health.record_success())
+        self.assertIs(self.health.state, HealthState.HEALTHY)
+        self.assertIsNone(self.health.next_probe_at)
+        self.assertEqual(self.health.transitions, 3)
+
+        # The probe interval starts over
+        for now in range(10, 13):
+            self.health.record_failure(now)
+        self.assertEqual(self.health.next_probe_at, 17)
+
+    def test_success_resets_failure_count(self):
+        self.health.record_failure(0)
+        self.health.record_failure(1)
+        self.health.record_success()
+        self.health.record_failure(2)
+
+        self.assertIs(self.health.state, HealthState.DEGRADED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.const import Platform
+
+from custom_components.light_manager_air import _async_handle_force_service
+from custom_components.light_manager_air.const import SERVICE_FORCE_TURN_ON, SERVICE_FORCE_TURN_OFF
+
+
+def _platform(domain, entities):
+    platform = MagicMock()
+    platform.domain = domain
+    platform.entities = entities
+    return platform
+
+
+class ForceServiceTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.light = MagicMock(async_force_turn_on=AsyncMock(), async_force_turn_off=AsyncMock())
+        self.switch = MagicMock(async_force_turn_on=AsyncMock(), async_force_turn_off=AsyncMock())
+        self.platforms = [
+            _platform(Platform.LIGHT, {"light.kitchen": self.light}),
+            _platform(Platform.SWITCH, {"switch.fan": self.switch}),
+        ]
+
+    async def _call(self, service, entity_ids):
+        call = MagicMock(service=service)
+        with patch("custom_components.light_manager_air.async_get_platforms", return_value=self.platforms), \
+                patch("custom_components.light_manager_air.async_extract_entity_ids",
+                      AsyncMock(return_value=set(entity_ids))):
+            await _async_handle_force_service(call)
+
+    async def test_force_turn_on_light_and_switch(self):
+        await self._call(SERVICE_FORCE_TURN_ON, ["light.kitchen", "switch.fan"])
+
+        self.light.async_force_turn_on.assert_awaited_once()
+        self.switch.async_force_turn_on.assert_awaited_once()
+
+    async def test_force_turn_off_only_targets(self):
+        await self._call(SERVICE_FORCE_TURN_OFF, ["switch.fan"])
+
+        self.light.async_force_turn_off.assert_not_awaited()
+        self.switch.async_force_turn_off.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from threading import Event
 from time import sleep
@@ -20,10 +21,39 @@ class MyTestCase(unittest.TestCase):
     def test_service_discovery(self):
         self._device()
 
+    def test_async_service_discovery(self):
+        light_manager = self._device()
+        hosts = asyncio.run(LMAir.async_discover(expected=light_manager.mac_address))
+        self.assertIn(light_manager.host, hosts)
+
     def test_all_off(self):
         light_manager = self._device()
         light_manager.send_command(f"typ,it,did,1833F4A0,aid,215,acmd,0,seq,6")
 
+    def test_send_commands(self):
+        light_manager = self._device()
+        markers = light_manager.load_markers()
+        self.assertGreaterEqual(len(markers), 10, "Not enough markers available, need at least 10!")
+
+        for batch_supported in (False, True):
+            with self.subTest(batch_supported=batch_supported):
+                light_manager.batch_supported = batch_supported
+                light_manager.send_commands([
+                    light_manager.create_command("typ,smk,8,1"),
+                    light_manager.create_command("typ,smk,9,1"),
+                ])
+                sleep(1)
+
+                markers = light_manager.load_markers()
+                self.assertTrue(markers[8].state, "Marker 9 should be ON after sending the commands")
+                self.assertTrue(markers[9].state, "Marker 10 should be ON after sending the commands")
+
+                light_manager.send_commands([
+                    light_manager.create_command("typ,smk,8,0"),
+                    light_manager.create_command("typ,smk,9,0"),
+                ])
+                sleep(1)
+
     def test_fixture_loading(self):
         zones, scenes = self._device().load_fixtures()
         print(f"Found {len(zones)} zones and {len(scenes)} scenes.")
@@ -0,0 +1,103 @@
+import unittest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+from custom_components.light_manager_air.lmair import LMAir, LMCommand, LMRetryPolicy
+
+
+class LMCommandTestCase(unittest.TestCase):
+
+    def test_marker_action(self):
+        self.assertEqual(LMCommand(None, "Marker", cmd="typ,smk,4,2").marker_action, (4, 2))
+        self.assertIsNone(LMCommand(None, "Light", cmd="typ,it,did,0996,aid,215,acmd,0,seq,6").marker_action)
+
+    def test_packable(self):
+        self.assertTrue(LMCommand(None, "Light", cmd="typ,it,did,0996,aid,215,acmd,0,seq,6").packable)
+
+        config = ET.fromstring("<command><name>Scene</name><param>scene=0&amp;scene=3&amp;delay=1</param></command>")
+        command = LMCommand(None, config=config)
+        self.assertEqual(command.params, [("cmd", "idx,3"), ("delay", "1")])
+        self.assertFalse(command.packable)
+
+    def test_http_request_with_url(self):
+        command = LMCommand(None, "Hue", cmd='typ,http,http://192.168.1.20/api/key/lights/3/state,{"on":true}')
+
+        self.assertEqual(command.http_request,
+                         ("PUT", "http://192.168.1.20/api/key/lights/3/state", '{"on":true}'))
+
+    def test_http_request_with_host_and_path(self):
+        command = LMCommand(None, "Shelly", cmd="typ,http,192.168.1.30,8080,/relay/0?turn=on")
+
+        self.assertEqual(command.http_request, ("GET", "http://192.168.1.30:8080/relay/0?turn=on", None))
+
+    def test_http_request_with_body(self):
+        command = LMCommand(None, "Webhook", cmd='typ,http,192.168.1.30,/hook,{"state":1}')
+
+        self.assertEqual(command.http_request, ("POST", "http://192.168.1.30/hook", '{"state":1}'))
+
+    def test_no_http_request(self):
+        self.assertIsNone(LMCommand(None, "Light", cmd="typ,it,did,0996,aid,215,acmd,0,seq,6").http_request)
+
+
+class LMRetryPolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = LMRetryPolicy(attempts=3, base_delay=1.0, max_delay=1.5, deadline=5.0,
+                                    retry_on=frozenset((LMRetryPolicy.CONNECT,)))
+
+    @patch("custom_components.light_manager_air.lmair.random.uniform", side_effect=lambda low, high: high)
+    def test_backoff_is_limited(self, uniform):
+        self.assertEqual(self.policy.next_delay(1, LMRetryPolicy.CONNECT, 0), 1.0)
+        self.assertEqual(self.policy.next_delay(2, LMRetryPolicy.CONNECT, 0), 1.5)
+
+    def test_attempts_are_limited(self):
+        self.assertIsNone(self.policy.next_delay(3, LMRetryPolicy.CONNECT, 0))
+
+    def test_only_given_failures_are_retried(self):
+        self.assertIsNone(self.policy.next_delay(1, LMRetryPolicy.READ_TIMEOUT, 0))
+        self.assertIsNone(self.policy.next_delay(1, LMRetryPolicy.HTTP, 0))
+
+    @patch("custom_components.light_manager_air.lmair.random.uniform", side_effect=lambda low, high: high)
+    def test_no_retry_after_deadline(self, uniform):
+        self.assertIsNone(self.policy.next_delay(1, LMRetryPolicy.CONNECT, 4.5))
+
+
+class SceneIndexTestCase(unittest.TestCase):
+
+    LIGHT_ON = "typ,it,did,0996,aid,215,acmd,1,seq,6"
+    BLIND_DOWN = "typ,it,did,0997,aid,215,acmd,0,seq,6"
+
+    def _scene(self, name, *commands):
+        command_list = "".join(f"<command><param>cmd={command}</param></command>" for command in commands)
+        config = ET.fromstring(f"<scene><name>{name}</name><param>cmd=idx,1</param>"
+                               f"<commandlist>{command_list}</commandlist></scene>")
+        return config, LMCommand(None, config=config)
+
+    def _light_manager(self, *scenes):
+        # Skip the requests of the constructor
+        light_manager = LMAir.__new__(LMAir)
+        configs, commands = zip(*scenes)
+        light_manager._scene_index = LMAir._build_scene_index(configs, commands)
+        return light_manager
+
+    def test_commands_are_replaced_by_scene(self):
+        config, scene = self._scene("Evening", self.LIGHT_ON, self.BLIND_DOWN)
+        light_manager = self._light_manager((config, scene))
+        commands = [LMCommand(None, "Blind", cmd=self.BLIND_DOWN), LMCommand(None, "Light", cmd=self.LIGHT_ON)]
+
+        self.assertEqual(light_manager.plan_commands(commands), [scene])
+
+    def test_commands_without_scene_are_kept(self):
+        light_manager = self._light_manager(self._scene("Evening", self.LIGHT_ON, self.BLIND_DOWN))
+        commands = [LMCommand(None, "Light", cmd=self.LIGHT_ON), LMCommand(None, "Marker", cmd="typ,smk,1,1")]
+
+        self.assertEqual(light_manager.plan_commands(commands), commands)
+
+    def test_scene_with_single_command_is_not_indexed(self):
+        config, scene = self._scene("Light", self.LIGHT_ON)
+
+        self.assertEqual(LMAir._build_scene_index([config], [scene]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from custom_components.light_manager_air.lmair import LMRadioFrame
+
+
+class RadioFrameTestCase(unittest.TestCase):
+
+    def test_intertechno(self):
+        # Device ID 0x51CD3A, no group, on, unit 10
+        frame = LMRadioFrame.decode(b"rfit,14734E9A")
+
+        self.assertEqual(frame.code, "rfit_14734E9A")
+        self.assertEqual(frame.device_id, "051CD3A")
+        self.assertEqual(frame.unit, 10)
+        self.assertEqual(frame.command, "on")
+
+    def test_intertechno_group_off(self):
+        frame = LMRadioFrame.decode(b"rfit,14734E20")
+
+        self.assertIsNone(frame.unit)
+        self.assertEqual(frame.command, "off")
+
+    def test_unknown_intertechno_code_is_passed_through(self):
+        frame = LMRadioFrame.decode(b"rfit,1234,extra")
+
+        self.assertEqual(frame.code, "rfit_1234")
+        self.assertEqual(frame.device_id, "1234")
+        self.assertEqual(frame.extra, ("extra",))
+
+    def test_no_radio_frame(self):
+        self.assertIsNone(LMRadioFrame.decode(b"temp,21"))
+        self.assertIsNone(LMRadioFrame.decode(b"rfit,"))
+        self.assertIsNone(LMRadioFrame.decode(b""))
+
+    def test_homematic(self):
+        frame = LMRadioFrame.decode(b"rfhm,0B1A84401A2B3C4D5E6F0102")
+
+        self.assertEqual(frame.device_id, "1A2B3C")
+        self.assertEqual(frame.command, "40")
+        self.assertEqual(frame.extra, ("4D5E6F", "0102"))
+
+    def test_short_homematic_code_is_passed_through(self):
+        frame = LMRadioFrame.decode(b"rfhm,0B1A8440")
+
+        self.assertEqual(frame.code, "rfhm_0B1A8440")
+        self.assertIsNone(frame.command)
+
+    def test_homematic_code_ignores_counter(self):
+        # Same sender, type and payload, only the message counter differs
+        first = LMRadioFrame.decode(b"rfhm,0B1A84401A2B3C0000000102")
+        second = LMRadioFrame.decode(b"rfhm,0B1B84401A2B3C0000000102")
+
+        self.assertNotEqual(first.signal_code, second.signal_code)
+        self.assertEqual(first.code, second.code)
+        self.assertEqual(first.code, "rfhm_1A2B3C_40")
+
+
+if __name__ == '__main__':
+    unittest.main()
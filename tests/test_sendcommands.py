@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock
+
+from custom_components.light_manager_air.lmair import LMAir, LMRequestError
+
+
+class SendCommandsTestCase(unittest.TestCase):
+
+    def _light_manager(self):
+        # Skip the requests of the constructor
+        light_manager = LMAir.__new__(LMAir)
+        light_manager._connector = MagicMock()
+        light_manager._scene_index = {}
+        light_manager._batch_supported = True
+        return light_manager
+
+    @staticmethod
+    def _commands(count):
+        commands = []
+        for i in range(count):
+            command = MagicMock(packable=True, params=[("cmd", f"typ,smk,{i},1")])
+            commands.append(command)
+        return commands
+
+    def test_rejected_batch_is_sent_one_by_one(self):
+        light_manager = self._light_manager()
+        light_manager._connector.send.side_effect = LMRequestError("Request was not successful!")
+        commands = self._commands(3)
+
+        self.assertEqual(light_manager.send_commands(commands), commands)
+
+        light_manager._connector.send.assert_called_once()
+        for command in commands:
+            command.call.assert_called_once()
+        self.assertFalse(light_manager.batch_supported)
+
+        # No further packed requests in this session
+        light_manager.send_commands(self._commands(2))
+        light_manager._connector.send.assert_called_once()
+
+    def test_rejected_commands_keep_packing(self):
+        light_manager = self._light_manager()
+        light_manager._connector.send.side_effect = LMRequestError("Wrong username or password!")
+        commands = self._commands(2)
+        commands[0].call.side_effect = LMRequestError("Wrong username or password!")
+
+        with self.assertRaises(LMRequestError):
+            light_manager.send_commands(commands)
+
+        commands[1].call.assert_not_called()
+        self.assertTrue(light_manager.batch_supported)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from custom_components.light_manager_air.helpers.signalaggregator import SignalAggregator, SignalPhase
+
+
+POLL_INTERVAL = 2.0
+
+
+class SignalAggregatorTestCase(unittest.TestCase):
+
+    def _aggregator(self, repeat_window=2.5, hold_time=3.0, rate_limit=5):
+        return SignalAggregator(repeat_window=repeat_window, hold_time=hold_time, rate_limit=rate_limit, rate_window=3.0)
+
+    @staticmethod
+    def _phases(events):
+        return [event.phase for event in events]
+
+    def test_repeats_are_one_press(self):
+        aggregator = self._aggregator()
+
+        events = aggregator.process(["code", "code", "code"], 0.0)
+        self.assertEqual(self._phases(events), [SignalPhase.PRESS])
+
+        events = aggregator.process([], POLL_INTERVAL * 2)
+        self.assertEqual(self._phases(events), [SignalPhase.RELEASE])
+        self.assertEqual(events[0].repeat_count, 3)
+
+    def test_tap_across_poll_boundary_is_no_hold(self):
+        aggregator = self._aggregator(hold_time=1.0)
+
+        events = aggregator.process(["code"], 0.0)
+        events += aggregator.process(["code"], POLL_INTERVAL)
+        events += aggregator.process([], POLL_INTERVAL * 2)
+        events += aggregator.process([], POLL_INTERVAL * 3)
+
+        self.assertEqual(self._phases(events), [SignalPhase.PRESS, SignalPhase.RELEASE])
+
+    def test_held_button_fires_one_hold(self):
+        aggregator = self._aggregator()
+
+        events = []
+        for poll in range(4):
+            events += aggregator.process(["code"], poll * POLL_INTERVAL)
+        events += aggregator.process([], POLL_INTERVAL * 5)
+
+        self.assertEqual(self._phases(events), [SignalPhase.PRESS, SignalPhase.HOLD, SignalPhase.RELEASE])
+        self.assertEqual(events[1].duration, POLL_INTERVAL * 2)
+
+    def test_flood_limit_drops_presses(self):
+        aggregator = self._aggregator(repeat_window=0.5, rate_limit=2)
+
+        events = []
+        for poll in range(3):
+            events += aggregator.process(["code"], float(poll))
+
+        self.assertEqual(self._phases(events), [SignalPhase.PRESS, SignalPhase.RELEASE, SignalPhase.PRESS,
+                                                SignalPhase.RELEASE])
+        self.assertEqual(aggregator.dropped, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()